@@ -0,0 +1,92 @@
+"""Stream many local FFmpeg processes through the shared pipe multiplexer.
+
+Spawns --streams FFmpeg processes decoding generated audio (a lavfi sine,
+so no network is involved), each wrapped in BufferedPCMAudio exactly as
+playback does, and drains them all from one thread on Discord's 20 ms
+clock. Fails unless every stream delivers its full length and the thread
+count stays flat no matter how many streams are running.
+
+    python benchmarks/bench_pipe_multiplexer.py --streams 100 --seconds 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("TOKEN", "benchmark")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("STATE_FILE", os.path.join(tempfile.mkdtemp(), "state.json"))
+
+import jukebox  # noqa: E402
+
+
+def open_stream(seconds, frequency):
+    source = jukebox.TimestampedFFmpegPCMAudio(
+        f"sine=frequency={frequency}:duration={seconds}",
+        before_options="-f lavfi",
+        options="-vn",
+        stderr=jukebox.FFmpegStderrLogger("localhost"),
+        media_host="localhost",
+    )
+    return jukebox.BufferedPCMAudio(source, buffer_seconds=3, startup_seconds=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=100)
+    parser.add_argument("--seconds", type=int, default=5)
+    args = parser.parse_args()
+
+    threads_before = threading.active_count()
+    started = time.perf_counter()
+    buffers = [open_stream(args.seconds, 220 + i) for i in range(args.streams)]
+    for buffer in buffers:
+        buffer.wait_until_ready()
+    startup = time.perf_counter() - started
+    time.sleep(0.2)  # let discord.py's short-lived stderr hand-off threads exit
+    threads_during = threading.active_count()
+
+    frames = [0] * len(buffers)
+    silence = [0] * len(buffers)
+    live = set(range(len(buffers)))
+    cpu_started = time.process_time()
+    clock = time.perf_counter()
+    while live:
+        for i in list(live):
+            frame = buffers[i].read()
+            if not frame:
+                live.discard(i)
+            elif buffers[i].underrun:
+                silence[i] += 1
+            else:
+                frames[i] += 1
+        clock += jukebox.BufferedPCMAudio.FRAME_SECONDS
+        time.sleep(max(0.0, clock - time.perf_counter()))
+    cpu = time.process_time() - cpu_started
+    for buffer in buffers:
+        buffer.cleanup()
+
+    expected = args.seconds * 50
+    short = [i for i, n in enumerate(frames) if n != expected]
+    print(f"streams:            {args.streams} x {args.seconds}s")
+    print(f"startup (all):      {startup:.2f}s")
+    print(f"threads:            {threads_before} before, {threads_during} while streaming")
+    print(f"frames per stream:  min {min(frames)}, max {max(frames)} (expected {expected})")
+    print(f"silence frames:     {sum(silence)} total")
+    print(f"CPU while draining: {cpu:.2f}s ({cpu / args.streams * 1000:.1f} ms per stream)")
+    print(f"pipes still watched: {jukebox.pipe_multiplexer.watched}")
+
+    # The multiplexer thread itself is the only one allowed to appear
+    if threads_during > threads_before + 1:
+        sys.exit("FAIL: thread count grew with the number of streams")
+    if short:
+        sys.exit(f"FAIL: {len(short)} stream(s) delivered the wrong number of frames")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Offline load test of the playback pipeline, without Discord.
+
+Runs the real play_song / advance_queue / YTDLSource pipeline (extraction
+through the stream cache and circuit breakers, FFmpeg, the read-ahead
+buffer and the pipe multiplexer) for many simulated guilds at once. Only
+the edges are stubbed:
+
+- yt-dlp: a stub extractor resolves each song to a local media file after
+  --extract-ms of simulated latency
+- media: FFmpeg-generated sine/noise WAV files served by a local HTTP server
+- voice: a stub voice client per guild consuming frames on a 20 ms clock,
+  like discord.py's AudioPlayer thread
+
+Each simulated guild starts with a few queued tracks and then issues /play,
+/skip and /move at the given average rates (Poisson arrivals). Reports
+track throughput, transition gaps (time from one track stopping to the next
+one's first audible frame), underruns and CPU per guild.
+
+    python benchmarks/loadtest.py --guilds 20 --duration 60
+"""
+
+import argparse
+import asyncio
+import functools
+import http.server
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("TOKEN", "benchmark")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("STATE_FILE", os.path.join(tempfile.mkdtemp(), "state.json"))
+
+import jukebox  # noqa: E402
+
+PAGE_URL = "https://loadtest.invalid/{}"
+
+
+class GuildStats:
+    def __init__(self):
+        self.tracks_started = 0
+        self.frames = 0
+        self.silence_frames = 0
+        self.underruns = 0
+        self.gaps = []  # seconds between a track stopping and the next being heard
+        self.commands = {"play": 0, "skip": 0, "move": 0}
+
+
+class StubVoiceClient:
+    """Stands in for discord.VoiceClient. play() runs the source on its own
+    thread, reading one frame per 20 ms and catching up when late, the way
+    discord.py's AudioPlayer does, and records what a listener would hear."""
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.source = None
+        self._end = threading.Event()
+        self._end.set()
+        self._resumed = threading.Event()
+        self._thread = None
+        self.ended_at = None
+
+    def is_connected(self):
+        return True
+
+    def is_playing(self):
+        return not self._end.is_set() and self._resumed.is_set()
+
+    def is_paused(self):
+        return not self._end.is_set() and not self._resumed.is_set()
+
+    def play(self, source, after=None):
+        if self.is_playing() or self.is_paused():
+            raise RuntimeError("Already playing audio.")
+        self.source = source
+        self._end = end = threading.Event()
+        self._resumed = resumed = threading.Event()
+        resumed.set()
+        self._thread = threading.Thread(
+            target=self._run, args=(source, after, end, resumed), daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, source, after, end, resumed):
+        stats = self.stats
+        stats.tracks_started += 1
+        heard = False
+        in_underrun = False
+        clock = time.perf_counter()
+        while not end.is_set():
+            if not resumed.is_set():
+                resumed.wait()
+                clock = time.perf_counter()
+                continue
+            frame = source.read()
+            if not frame:
+                self.stop()
+                break
+            buffer = getattr(source, "buffer", None)
+            if buffer is not None and buffer.underrun:
+                stats.silence_frames += 1
+                if heard and not in_underrun:
+                    stats.underruns += 1
+                in_underrun = True
+            else:
+                stats.frames += 1
+                in_underrun = False
+                if not heard:
+                    heard = True
+                    if self.ended_at is not None:
+                        stats.gaps.append(time.perf_counter() - self.ended_at)
+            clock += jukebox.BufferedPCMAudio.FRAME_SECONDS
+            time.sleep(max(0.0, clock - time.perf_counter()))
+        source.cleanup()
+        if after:
+            after(None)
+
+    def stop(self):
+        if not self._end.is_set():
+            self.ended_at = time.perf_counter()
+            self._end.set()
+            self._resumed.set()
+
+    def pause(self):
+        self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    def join(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+
+
+class StubGuild:
+    def __init__(self, guild_id, stats):
+        self.id = guild_id
+        self.voice_client = StubVoiceClient(stats)
+
+
+class StubExtractor:
+    """What new_audio_extractor() returns during the load test"""
+
+    def __init__(self, base_url, latency):
+        self.base_url = base_url
+        self.latency = latency
+
+    def extract_info(self, url, download=False):
+        time.sleep(self.latency)
+        name = url.rsplit("/", 1)[-1]
+        return {"url": f"{self.base_url}/{name}", "http_headers": {"User-Agent": "jukebox-loadtest"}}
+
+
+def generate_media(directory, count, seconds):
+    """Write `count` WAV files alternating between a sine tone and noise"""
+    names = []
+    for i in range(count):
+        name = f"track-{i}.wav"
+        generator = (
+            f"sine=frequency={220 + 55 * i}:duration={seconds}"
+            if i % 2 == 0
+            else f"anoisesrc=duration={seconds}:amplitude=0.2"
+        )
+        subprocess.run(
+            ["ffmpeg", "-loglevel", "error", "-y", "-f", "lavfi", "-i", generator,
+             "-ar", "48000", "-ac", "2", os.path.join(directory, name)],
+            check=True,
+        )
+        names.append(name)
+    return names
+
+
+def serve_directory(directory):
+    """Serve `directory` over HTTP on a free local port, in a daemon thread"""
+
+    class QuietHandler(http.server.SimpleHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(QuietHandler, directory=directory)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def song(name, guild_id):
+    entry = {"url": PAGE_URL.format(name), "title": name, "duration": 0, "uploader": "loadtest"}
+    return jukebox.build_song_info(entry, jukebox.RequesterRef(guild_id))
+
+
+async def simulate_guild(guild_id, names, args, deadline):
+    """Drive one guild like its users would: queue some tracks, then issue
+    /play, /skip and /move at random around the configured rates"""
+    guild = jukebox.bot.get_guild(guild_id)
+    stats = guild.voice_client.stats
+    queue = jukebox.get_queue(guild_id)
+    for _ in range(args.tracks):
+        queue.add(song(random.choice(names), guild_id), "end")
+    await jukebox.advance_queue(guild_id, None)
+
+    rates = {"play": args.play_rate, "skip": args.skip_rate, "move": args.move_rate}
+    total_rate = sum(rates.values()) / 60
+    while total_rate:
+        wait = random.expovariate(total_rate)
+        if time.monotonic() + wait >= deadline:
+            return
+        await asyncio.sleep(wait)
+        command = random.choices(list(rates), weights=list(rates.values()))[0]
+        stats.commands[command] += 1
+        if command == "play":
+            queue.add(song(random.choice(names), guild_id), "end")
+            jukebox.save_state()
+            if not queue.is_playing:
+                await jukebox.advance_queue(guild_id, None)
+        elif command == "skip":
+            if guild.voice_client.is_playing():
+                queue.skip_requested = True
+                guild.voice_client.stop()
+        elif command == "move" and len(queue.queue) >= 2:
+            queue.move(*random.sample(range(len(queue.queue)), 2))
+            jukebox.save_state()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run(args, names, base_url):
+    jukebox.bot.loop = asyncio.get_running_loop()
+    jukebox.new_audio_extractor = lambda: StubExtractor(base_url, args.extract_ms / 1000)
+    guilds = {i: StubGuild(i, GuildStats()) for i in range(1, args.guilds + 1)}
+    jukebox.bot.get_guild = guilds.get
+
+    threads_before = threading.active_count()
+    cpu_started = time.process_time()
+    started = time.monotonic()
+    deadline = started + args.duration
+    await asyncio.gather(*(simulate_guild(g, names, args, deadline) for g in guilds))
+    await asyncio.sleep(max(0.0, deadline - time.monotonic()))
+    elapsed = time.monotonic() - started
+    cpu = time.process_time() - cpu_started
+    threads_during = threading.active_count()
+
+    for guild_id, guild in guilds.items():
+        jukebox.get_queue(guild_id).generation += 1  # don't advance any further
+        guild.voice_client.stop()
+    for guild in guilds.values():
+        guild.voice_client.join(timeout=2)
+    return guilds, elapsed, cpu, threads_before, threads_during
+
+
+def report(args, guilds, elapsed, cpu, threads_before, threads_during):
+    stats = [g.voice_client.stats for g in guilds.values()]
+    gaps = [gap for s in stats for gap in s.gaps]
+    tracks = sum(s.tracks_started for s in stats)
+    frames = sum(s.frames for s in stats)
+    silence = sum(s.silence_frames for s in stats)
+    commands = {c: sum(s.commands[c] for s in stats) for c in ("play", "skip", "move")}
+    print(f"guilds:              {args.guilds} for {elapsed:.0f}s "
+          f"(extract {args.extract_ms} ms, {args.track_seconds}s tracks)")
+    print(f"commands:            " + ", ".join(f"{n} {c}" for c, n in commands.items()))
+    print(f"tracks started:      {tracks} ({tracks / elapsed * 60:.1f}/min)")
+    print(f"audio delivered:     {frames * 0.02:.0f}s "
+          f"({frames * 0.02 / elapsed / args.guilds * 100:.1f}% of wall time per guild)")
+    print(f"transition gaps:     p50 {percentile(gaps, 0.5) * 1000:.0f} ms, "
+          f"p95 {percentile(gaps, 0.95) * 1000:.0f} ms, max {max(gaps, default=0) * 1000:.0f} ms "
+          f"over {len(gaps)} transitions")
+    print(f"underruns:           {sum(s.underruns for s in stats)} "
+          f"({silence * 0.02:.1f}s of silence, {silence / max(frames + silence, 1) * 100:.2f}%)")
+    print(f"CPU:                 {cpu:.1f}s total, {cpu / elapsed / args.guilds * 100:.2f}% of a core per guild")
+    print(f"threads:             {threads_before} before, {threads_during} under load")
+    if gaps:
+        print(f"gap stdev:           {statistics.pstdev(gaps) * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=60, help="seconds to run")
+    parser.add_argument("--tracks", type=int, default=5, help="tracks queued per guild up front")
+    parser.add_argument("--media-files", type=int, default=6)
+    parser.add_argument("--track-seconds", type=int, default=20)
+    parser.add_argument("--extract-ms", type=int, default=200, help="simulated yt-dlp latency")
+    parser.add_argument("--play-rate", type=float, default=1, help="/play per guild per minute")
+    parser.add_argument("--skip-rate", type=float, default=2, help="/skip per guild per minute")
+    parser.add_argument("--move-rate", type=float, default=1, help="/move per guild per minute")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory() as media_dir:
+        names = generate_media(media_dir, args.media_files, args.track_seconds)
+        server = serve_directory(media_dir)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            results = asyncio.run(run(args, names, base_url))
+        finally:
+            server.shutdown()
+    report(args, *results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""Microbenchmarks for the hot pure-Python paths, with a regression check.
+
+Times MusicQueue operations (add/next, also in fair-queue mode, the next
+song in shuffle-play, queueing a 100-song playlist, shuffle, and the /move
+and /remove rebuilds), save_state/load_state with 10, 1k and 100k queued
+songs spread over many guilds (in both STATE_FORMATs), the now-playing and
+/queue embeds, and FFmpeg header building. Each case reports the median
+per-call time over several rounds of at least --min-time seconds each.
+
+Results are normalised by a fixed pure-Python calibration loop, so a
+baseline recorded on one machine can be checked on another:
+
+    python benchmarks/microbench.py                  # print results
+    python benchmarks/microbench.py --check          # compare with baseline
+    python benchmarks/microbench.py --save-baseline  # record a new baseline
+
+--check exits non-zero if any case got more than --threshold slower than
+benchmarks/microbench_baseline.json. The default (twice as slow) leaves
+room for run-to-run noise, mostly in the small state file cases, which
+are dominated by file system latency; smaller changes still show in the
+per-case percentages. A case over the threshold is measured again, with a
+fresh calibration, up to --confirm more times and only counts as a
+regression if it stays over every time: a busy machine slows down one
+run, a regression slows down all of them.
+"""
+
+import argparse
+import functools
+import json
+import math
+import os
+import statistics
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("TOKEN", "benchmark")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("STATE_FILE", os.path.join(tempfile.mkdtemp(), "state.json"))
+
+import jukebox  # noqa: E402
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "microbench_baseline.json")
+QUEUE_SIZES = (10, 1_000, 100_000)
+# (songs, guilds) for the state file cases
+STATE_SIZES = ((10, 1), (1_000, 100), (100_000, 1_000))
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:124.0) Gecko/20100101 Firefox/124.0",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-us,en;q=0.5",
+    "Sec-Fetch-Mode": "navigate",
+}
+
+# Flat playlist entries, as extract_playlist returns them
+PLAYLIST = [
+    {"url": f"https://www.youtube.com/watch?v={i:011d}", "title": f"Playlist song {i}", "duration": 200}
+    for i in range(100)
+]
+
+
+def make_song(i):
+    return jukebox.build_song_info(
+        {
+            "url": f"https://www.youtube.com/watch?v={i:011d}",
+            "title": f"Benchmark song number {i} (official audio)",
+            "duration": 180 + i % 120,
+            "uploader": f"Uploader {i % 50}",
+        },
+        jukebox.RequesterRef(100_000 + i % 7),
+    )
+
+
+def make_queue(size):
+    queue = jukebox.MusicQueue()
+    for i in range(size):
+        queue.add(make_song(i))
+    queue.current = make_song(size)
+    queue.is_playing = True
+    return queue
+
+
+def fill_guilds(songs, guilds):
+    jukebox.music_queues.clear()
+    per_guild = songs // guilds
+    for guild_id in range(1, guilds + 1):
+        queue = jukebox.get_queue(guild_id)
+        for i in range(per_guild):
+            queue.add(make_song(guild_id * per_guild + i))
+
+
+def calibration():
+    total = 0
+    for i in range(10_000):
+        total += i * i % 7
+    return total
+
+
+def cases():
+    """name -> zero-argument callable timing one operation, or a
+    (setup, callable) pair when the case needs the guilds filled first"""
+    result = {}
+
+    for size in QUEUE_SIZES:
+        queue = make_queue(size)
+        song = make_song(-1)
+
+        def add_next(queue=queue, song=song):
+            queue.add(song)
+            queue.get_next()
+
+        def extend(queue=queue, size=size):
+            queue.extend(PLAYLIST, None, position=size // 2)
+            for _ in PLAYLIST:
+                queue.get_next()
+
+        def shuffle(queue=queue):
+            queue.shuffle()
+
+        def move(queue=queue, size=size):
+            queue.move(size // 4, size * 3 // 4)
+
+        def remove(queue=queue, song=song):
+            queue.pop_at(len(queue.queue) // 2)
+            queue.add(song)
+
+        fair = make_queue(size)
+        fair.set_fair(True)
+
+        def fair_add_next(queue=fair, song=song):
+            queue.add(song)
+            queue.get_next()
+
+        result[f"queue_add_next[{size}]"] = add_next
+        result[f"fair_queue_add_next[{size}]"] = fair_add_next
+
+        shuffled = make_queue(size)
+        shuffled.set_shuffled(True)
+
+        def shuffle_play_next(queue=shuffled):
+            queue.requeue(queue.get_next())
+
+        result[f"shuffle_play_next[{size}]"] = shuffle_play_next
+        result[f"queue_extend[{size}]"] = extend
+        result[f"queue_shuffle[{size}]"] = shuffle
+        result[f"queue_move[{size}]"] = move
+        result[f"queue_remove[{size}]"] = remove
+
+    def save(state_format):
+        jukebox.STATE_FORMAT = state_format
+        jukebox.save_state()
+
+    def load(state_format):
+        jukebox.STATE_FORMAT = state_format  # so loading doesn't convert
+        jukebox.music_queues.clear()
+        jukebox.load_state()
+
+    for songs, guilds in STATE_SIZES:
+        for state_format, suffix in (("json", ""), ("binary", "_binary")):
+            setup = functools.partial(fill_guilds, songs, guilds)
+            save_format = functools.partial(save, state_format)
+            result[f"save_state{suffix}[{songs}]"] = (setup, save_format)
+            result[f"load_state{suffix}[{songs}]"] = (
+                lambda setup=setup, save_format=save_format: (setup(), save_format()),
+                functools.partial(load, state_format),
+            )
+
+    song = make_song(0)
+    result["now_playing_embed"] = lambda: jukebox.build_now_playing_embed(
+        song, footer="🔁", up_next="Benchmark song number 1"
+    )
+    for size in (10, 1_000):
+        queue = make_queue(size)
+        result[f"queue_embed[{size}]"] = lambda queue=queue: jukebox.build_queue_embed(queue)
+    result["ffmpeg_before_options"] = lambda: jukebox.ffmpeg_before_options(HEADERS)
+    return result
+
+
+def measure(func, rounds, min_time):
+    """Median seconds per call over `rounds` rounds, each calling `func`
+    for at least `min_time` seconds"""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    if elapsed < min_time:
+        number = math.ceil(number * min_time / elapsed)
+    return statistics.median(timer.repeat(repeat=rounds, number=number)) / number
+
+
+def measure_case(case, rounds, min_time):
+    if isinstance(case, tuple):
+        setup, case = case
+        setup()
+    return measure(case, rounds, min_time)
+
+
+def run(selected, rounds, min_time):
+    """(calibration seconds, {name: (case, seconds per call)})"""
+    calibrate = measure(calibration, rounds, min_time)
+    results = {}
+    for name, case in cases().items():
+        if selected and not any(pattern in name for pattern in selected):
+            continue
+        results[name] = (case, measure_case(case, rounds, min_time))
+    jukebox.music_queues.clear()
+    # Once more at the end, in case the machine got busier or quieter
+    calibrate = min(calibrate, measure(calibration, rounds, min_time))
+    return calibrate, results
+
+
+def confirm(suspects, rounds, min_time):
+    """Measure each of `suspects` ({name: (case, relative time)}) again
+    against a fresh calibration; {name: best relative time so far}"""
+    calibrate = measure(calibration, rounds, min_time)
+    best = {
+        name: min(relative, measure_case(case, rounds, min_time) / calibrate)
+        for name, (case, relative) in suspects.items()
+    }
+    jukebox.music_queues.clear()
+    return best
+
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help="only run cases whose name contains one of these")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.3,
+                        help="seconds each round of a case runs for at least")
+    parser.add_argument("--check", action="store_true", help="fail on regressions against the baseline")
+    parser.add_argument("--threshold", type=float, default=1.0,
+                        help="allowed slowdown before --check fails (1.0 = twice as slow)")
+    parser.add_argument("--confirm", type=int, default=2,
+                        help="times a case over the threshold is re-measured before it fails --check")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    calibrate, results = run(args.cases, args.rounds, args.min_time)
+    relatives = {name: seconds / calibrate for name, (_, seconds) in results.items()}
+
+    baseline = {}
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)["cases"]
+
+    def over_threshold(name):
+        return name in baseline and relatives[name] / baseline[name] > 1 + args.threshold
+
+    for attempt in range(args.confirm):
+        suspects = {
+            name: (results[name][0], relatives[name]) for name in relatives if over_threshold(name)
+        }
+        if not suspects:
+            break
+        print(f"Re-measuring {', '.join(suspects)} ({attempt + 1}/{args.confirm})")
+        relatives.update(confirm(suspects, args.rounds, args.min_time))
+
+    regressions = []
+    print(f"{'case':32} {'per call':>12} {'vs baseline':>12}")
+    for name, relative in relatives.items():
+        change = ""
+        if name in baseline:
+            ratio = relative / baseline[name]
+            change = f"{(ratio - 1) * 100:+.0f}%"
+            if ratio > 1 + args.threshold:
+                regressions.append(name)
+                change += " !"
+        print(f"{name:32} {format_time(relative * calibrate):>12} {change:>12}")
+    print(f"(calibration loop: {format_time(calibrate)})")
+
+    if args.save_baseline:
+        cases_out = dict(baseline)
+        cases_out.update(relatives)
+        with open(BASELINE_FILE, "w") as f:
+            json.dump({"unit": "calibration loops", "cases": cases_out}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {BASELINE_FILE}")
+
+    if args.check and regressions:
+        print(f"Regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
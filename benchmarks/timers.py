@@ -0,0 +1,177 @@
+"""Per-guild timers at scale: the shared TimerWheel vs a task per timer.
+
+Simulates a bot in many guilds, each with a periodic timer re-armed every
+time it fires (like the live now-playing card) and a long one-shot timer
+that is armed and cancelled as members leave and rejoin (like auto-leave),
+with a configurable churn rate. Time is scaled down so a long run fits in
+a few seconds: one wheel tick stands for one second.
+
+Runs the same workload through jukebox.TimerWheel and through the previous
+approach, an asyncio task sleeping per timer that gets cancelled, and
+reports the cost of arming/cancelling, how late timers fired, CPU used and
+memory held by the pending timers.
+
+    python benchmarks/timers.py --guilds 10000 --duration 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("TOKEN", "benchmark")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+os.environ.setdefault("STATE_FILE", os.path.join(tempfile.mkdtemp(), "state.json"))
+
+import jukebox  # noqa: E402
+
+
+class TaskTimers:
+    """The previous approach: one sleeping task per pending timer"""
+
+    def __init__(self):
+        self.tasks = {}
+
+    def schedule(self, key, delay, callback):
+        self.cancel(key)
+        self.tasks[key] = asyncio.create_task(self._sleep(key, delay, callback))
+
+    def cancel(self, key):
+        task = self.tasks.pop(key, None)
+        if task:
+            task.cancel()
+
+    def pending(self, key):
+        return key in self.tasks
+
+    async def _sleep(self, key, delay, callback):
+        await asyncio.sleep(delay)
+        del self.tasks[key]
+        callback()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run(timers, args):
+    """Drive the workload through `timers`; returns the measurements"""
+    scale = args.tick  # real seconds per simulated second
+    lateness = []
+    fired = 0
+    arm_seconds = 0.0
+    arms = 0
+
+    def arm(key, delay, callback):
+        nonlocal arm_seconds, arms
+        started = time.perf_counter()
+        timers.schedule(key, delay * scale, callback)
+        arm_seconds += time.perf_counter() - started
+        arms += 1
+
+    def periodic(guild_id, deadline):
+        nonlocal fired
+        fired += 1
+        now = time.monotonic()
+        lateness.append(now - deadline)
+        arm(("card", guild_id), args.period, lambda: periodic(guild_id, now + args.period * scale))
+
+    def one_shot(deadline):
+        nonlocal fired
+        fired += 1
+        lateness.append(time.monotonic() - deadline)
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    now = time.monotonic()
+    for guild_id in range(args.guilds):
+        # Spread the first firings over one period, as guilds start playing
+        # at different times
+        offset = random.uniform(1, args.period)
+        arm(("card", guild_id), offset, lambda g=guild_id, d=now + offset * scale: periodic(g, d))
+    memory = tracemalloc.get_traced_memory()[0] - memory_before
+    tracemalloc.stop()
+
+    cpu_started = time.process_time()
+    started = time.monotonic()
+    deadline = started + args.duration
+    churn = 0
+    cancel_seconds = 0.0
+    cancels = 0
+    while time.monotonic() < deadline:
+        # Each simulated second, some guilds empty (arm) or refill (cancel)
+        for _ in range(max(1, int(args.guilds * args.churn))):
+            guild_id = random.randrange(args.guilds)
+            key = ("leave", guild_id)
+            if timers.pending(key):
+                started_cancel = time.perf_counter()
+                timers.cancel(key)
+                cancel_seconds += time.perf_counter() - started_cancel
+                cancels += 1
+            else:
+                arm(key, args.leave, lambda d=time.monotonic() + args.leave * scale: one_shot(d))
+            churn += 1
+        await asyncio.sleep(scale)
+    cpu = time.process_time() - cpu_started
+    elapsed = time.monotonic() - started
+
+    for guild_id in range(args.guilds):
+        timers.cancel(("card", guild_id))
+        timers.cancel(("leave", guild_id))
+    return {
+        "arm_us": arm_seconds / arms * 1e6,
+        "cancel_us": cancel_seconds / max(cancels, 1) * 1e6,
+        "fired": fired,
+        "late_p50_ms": percentile(lateness, 0.5) * 1000,
+        "late_p99_ms": percentile(lateness, 0.99) * 1000,
+        "cpu_percent": cpu / elapsed * 100,
+        "memory_kb": memory / 1024,
+        "churn": churn,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=10_000)
+    parser.add_argument("--duration", type=float, default=5, help="real seconds per run")
+    parser.add_argument("--tick", type=float, default=0.01, help="real seconds per simulated second")
+    parser.add_argument("--period", type=float, default=15, help="periodic timer, simulated seconds")
+    parser.add_argument("--leave", type=float, default=300, help="one-shot timer, simulated seconds")
+    parser.add_argument("--churn", type=float, default=0.01,
+                        help="fraction of guilds arming/cancelling a one-shot timer per simulated second")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    results = {}
+    for name, make in (("TimerWheel", lambda: jukebox.TimerWheel(tick=args.tick)), ("task per timer", TaskTimers)):
+        random.seed(args.seed)
+        results[name] = asyncio.run(run(make(), args))
+
+    print(f"{args.guilds} guilds for {args.duration:g}s "
+          f"({args.duration / args.tick:.0f} simulated seconds, churn {args.churn:.1%}/s)")
+    print(f"{'':22}" + "".join(f"{name:>18}" for name in results))
+    rows = (
+        ("arm", "arm_us", "{:.2f} µs"),
+        ("cancel", "cancel_us", "{:.2f} µs"),
+        ("timers fired", "fired", "{}"),
+        ("lateness p50", "late_p50_ms", "{:.1f} ms"),
+        ("lateness p99", "late_p99_ms", "{:.1f} ms"),
+        ("CPU", "cpu_percent", "{:.1f}% of a core"),
+        ("memory, 1 timer/guild", "memory_kb", "{:.0f} KiB"),
+    )
+    for label, key, fmt in rows:
+        print(f"{label:22}" + "".join(f"{fmt.format(r[key]):>18}" for r in results.values()))
+    print("(lateness is relative to the requested delay; the wheel rounds it to whole ticks, so it can\n"
+          " fire up to a tick early, and timers due on the same tick fire as one batch)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,22 @@
 import asyncio
+import bisect
+import concurrent.futures
+import functools
+import itertools
 import json
-import queue as thread_queue
+import math
+import random
+import resource
 import re
+import selectors
 import shlex
 import signal
+import sqlite3
+import struct
 import sys
 import threading
-from urllib.parse import urlsplit
+import time
+from urllib.parse import parse_qs, urlsplit
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -109,6 +119,22 @@ AUDIO_BUFFER_SECONDS = env_nonnegative_float("AUDIO_BUFFER_SECONDS", 3)
 AUDIO_BUFFER_STARTUP_SECONDS = env_nonnegative_float(
     "AUDIO_BUFFER_STARTUP_SECONDS", 1
 )
+# The two values above are only the starting point for each media host: a
+# host's buffer grows after underruns or FFmpeg reconnects (up to
+# AUDIO_BUFFER_MAX_SECONDS) and shrinks again after a run of stable streams
+# (down to AUDIO_BUFFER_MIN_SECONDS), so a solid CDN gets a short startup
+# delay while a flaky one gets a deeper cushion. See MediaHostProfile.
+AUDIO_BUFFER_MAX_SECONDS = max(
+    AUDIO_BUFFER_SECONDS, env_nonnegative_float("AUDIO_BUFFER_MAX_SECONDS", 10)
+)
+AUDIO_BUFFER_MIN_SECONDS = min(
+    AUDIO_BUFFER_SECONDS, env_nonnegative_float("AUDIO_BUFFER_MIN_SECONDS", 1)
+)
+
+# Already-played PCM kept in the read-ahead buffer so a short /rewind is
+# served instantly instead of re-spawning FFmpeg (~190 KB per second kept,
+# per playing guild). 0 disables the history window.
+AUDIO_SEEK_HISTORY_SECONDS = env_nonnegative_float("AUDIO_SEEK_HISTORY_SECONDS", 5)
 
 
 # Leave voice automatically after being alone (no non-bot members left in the
@@ -121,14 +147,93 @@ AUTO_LEAVE_SECONDS = int(os.getenv("AUTO_LEAVE_SECONDS", "300"))
 # /pause is left alone). Independent of AUTO_LEAVE_SECONDS.
 AUTO_PAUSE = env_flag("AUTO_PAUSE", "true")
 
+# When the bot is dropped from voice mid-song without anyone asking it to
+# leave (a voice server crash, a network blip discord.py couldn't ride out),
+# rejoin the same channel and carry on from where the song was, keeping its
+# FFmpeg process and read-ahead buffer open, for up to this many seconds.
+# A disconnect Discord forces on the bot (a moderator's Disconnect, the
+# channel being deleted) is never undone, and only one rejoin is attempted
+# per window. 0 disables reconnecting.
+VOICE_RECONNECT_SECONDS = int(os.getenv("VOICE_RECONNECT_SECONDS", "30"))
+
+# Fair-queue mode each guild starts in (toggled per guild with /fairqueue):
+# songs play from each requester's own list in turn, so one user's 500-song
+# playlist can't hold up everyone else's requests.
+FAIR_QUEUE = env_flag("FAIR_QUEUE", "false")
+
+# Autoplay each guild starts with (toggled per guild with /autoplay): when
+# the queue runs out under loop_mode "off", carry on with tracks related to
+# the last one. Candidates come from the YouTube mix of the playing song and
+# are fetched in the background once the queue is down to
+# AUTOPLAY_PREFETCH_AT songs, so carrying on doesn't wait for an extraction.
+AUTOPLAY = env_flag("AUTOPLAY", "false")
+AUTOPLAY_POOL_SIZE = 10
+AUTOPLAY_PREFETCH_AT = 2
+
 # Per-guild queue, loop/notify mode, and volume survive a restart via a small
-# JSON snapshot at this path (relative to the working directory by default -
+# snapshot at this path (relative to the working directory by default -
 # /app in the container). Written after each meaningful change and on clean
 # shutdown; loaded once at startup. In Docker, mount a host path over this
 # file (or its parent directory) for it to survive container recreation, not
 # just an in-place restart - see README.
 STATE_FILE = os.getenv("STATE_FILE", "state.json")
 
+# How STATE_FILE is written: "json", or "binary" - a compact record file
+# that's faster to save and load with large queues (see save_state). Either
+# format is read whatever this says, and a file in the other one is
+# converted right after loading.
+STATE_FORMAT = os.getenv("STATE_FORMAT", "json").lower()
+if STATE_FORMAT not in ("json", "binary"):
+    logging.warning("Invalid STATE_FORMAT '%s'; defaulting to json", STATE_FORMAT)
+    STATE_FORMAT = "json"
+
+# How far into the current song each guild is gets checkpointed this often
+# (and on clean shutdown) to a small sidecar next to STATE_FILE, so a restart
+# resumes mid-song instead of from the top without rewriting the whole state
+# file every few seconds. 0 disables the periodic checkpoint (shutdown still
+# records it).
+POSITION_SAVE_SECONDS = env_nonnegative_float("POSITION_SAVE_SECONDS", 10)
+POSITION_FILE = f"{STATE_FILE}.position"
+
+# Every finished play (track, guild, requester, when, how long, skipped or
+# not) is logged to this SQLite file for /stats and popularity-driven cache
+# warming. Unlike /history it survives leaving voice and restarts. Empty
+# disables it. SQLite keeps -wal/-shm files beside it, so in Docker mount its
+# directory rather than the file.
+STATS_FILE = os.getenv("STATS_FILE", f"{STATE_FILE}.stats.sqlite")
+
+# Only the HISTORY_TAIL most recent songs of a session are kept in memory;
+# older ones, up to HISTORY_LIMIT, spill to a per-guild ring file in this
+# directory, so a long session (or HISTORY_LIMIT=-1) costs disk, not
+# memory. Files are deleted when the session ends. Empty keeps all of the
+# history in memory.
+HISTORY_SPILL_DIR = os.getenv("HISTORY_SPILL_DIR", f"{STATE_FILE}.history")
+HISTORY_TAIL = 50
+
+# After a restart, re-check every restored queue entry in the background so
+# dead or region-blocked videos are dropped before they're reached (each one
+# would otherwise cost a failed extraction and count towards
+# MAX_PLAYBACK_ERRORS). Runs on its own small thread pool so it never
+# competes with extractions for songs that are about to play.
+VALIDATE_RESTORED_QUEUES = env_flag("VALIDATE_RESTORED_QUEUES", "true")
+VALIDATION_CONCURRENCY = 2
+VALIDATION_BATCH_SIZE = 10
+VALIDATION_BATCH_PAUSE_SECONDS = 1
+
+# Also at startup, pre-resolve the stream URLs of each restored queue's next
+# song and of the WARM_POPULAR_TRACKS most played tracks (from STATS_FILE),
+# on the same background pool, so the first song after a restart starts as
+# fast as a warm transition instead of waiting on yt-dlp.
+WARM_STREAM_CACHE = env_flag("WARM_STREAM_CACHE", "true")
+WARM_POPULAR_TRACKS = 10
+
+# Guilds whose queue is empty and settings are all defaults are dropped from
+# memory once nobody has touched them for this many seconds (nothing about
+# them is persisted, so a later command just starts them afresh). Keeps
+# memory proportional to the guilds actually in use. 0 keeps every guild.
+QUEUE_EVICT_SECONDS = int(os.getenv("QUEUE_EVICT_SECONDS", "600"))
+QUEUE_SWEEP_SECONDS = 60
+
 # Command receipts ("✅ Added to queue", "⏭️ Skipped!", ...) are shown only to
 # the invoker (ephemeral) to keep the channel quiet; the channel-wide signal is
 # the auto-announcement system governed by /notifications. Set to false to get
@@ -139,6 +244,11 @@ EPHEMERAL_REPLIES = env_flag("EPHEMERAL_REPLIES", "true")
 # false to send plain cards without buttons.
 CONTROL_BUTTONS = env_flag("CONTROL_BUTTONS", "true")
 
+# The latest now-playing card is kept live: edited every this many seconds
+# with a progress bar while someone is listening (not while paused or alone
+# in the channel). 0 leaves cards static.
+LIVE_CARD_SECONDS = int(os.getenv("LIVE_CARD_SECONDS", "15"))
+
 # Discord bot setup - Slash commands only
 intents = discord.Intents.default()
 # intents.message_content = True
@@ -159,6 +269,15 @@ class JukeboxBot(commands.Bot):
         # Route presses of the playback-control buttons (fixed custom_ids) to
         # a fresh view, including buttons on cards sent before a restart.
         self.add_view(JukeboxControls())
+        arm_queue_sweep()
+        if POSITION_SAVE_SECONDS > 0:
+            self._position_task = asyncio.create_task(checkpoint_positions())
+        # Queued first, so its extractions run ahead of validation's on the
+        # shared background pool
+        if WARM_STREAM_CACHE:
+            self._warm_task = asyncio.create_task(warm_stream_cache())
+        if VALIDATE_RESTORED_QUEUES:
+            self._validation_task = asyncio.create_task(validate_restored_queues())
 
     def _on_shutdown_signal(self):
         if self._shutdown_requested:
@@ -171,6 +290,8 @@ class JukeboxBot(commands.Bot):
     async def close(self):
         logging.info("Client close started")
         save_state()
+        save_positions()
+        play_stats.close()
         await super().close()
         logging.info("Client close finished")
 
@@ -249,6 +370,14 @@ def new_metadata_extractor():
     return yt_dlp.YoutubeDL(dict(ytdl_format_options))
 
 
+# Low-priority extraction work (restored-queue validation and the like) runs
+# here rather than on the event loop's default executor, which serves the
+# extractions users are waiting on.
+background_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=VALIDATION_CONCURRENCY, thread_name_prefix="jukebox-background"
+)
+
+
 def new_audio_extractor():
     """Build a fresh YoutubeDL for resolving a playable audio URL"""
     return yt_dlp.YoutubeDL(dict(ytdl_audio_options))
@@ -284,169 +413,1430 @@ def ffmpeg_before_options(http_headers):
     return before_options
 
 
+class MediaHostProfile:
+    """Adaptive read-ahead sizing for one media host, persisted in STATE_FILE.
+
+    Grows the host's buffer by GROW_FACTOR after every underrun or FFmpeg
+    reconnect, and shrinks it by SHRINK_FACTOR after STABLE_STREAMS clean
+    streams in a row. Updated from the read-ahead and FFmpeg stderr threads;
+    each update is a couple of attribute writes, so races only ever cost a
+    slightly stale size, never a corrupt one.
+    """
+
+    GROW_FACTOR = 1.5
+    SHRINK_FACTOR = 0.8
+    STABLE_STREAMS = 3
+    # Streams shorter than this say too little about a host to count as stable
+    STABLE_MIN_SECONDS = 30
+
+    def __init__(self, buffer_seconds=None):
+        self.buffer_seconds = AUDIO_BUFFER_SECONDS if buffer_seconds is None else buffer_seconds
+        self.streams = 0
+        self.underruns = 0
+        self.reconnects = 0
+        self.stable_streak = 0
+
+    @property
+    def startup_seconds(self):
+        """AUDIO_BUFFER_STARTUP_SECONDS scaled along with the buffer size"""
+        if not AUDIO_BUFFER_SECONDS:
+            return 0
+        scaled = AUDIO_BUFFER_STARTUP_SECONDS * self.buffer_seconds / AUDIO_BUFFER_SECONDS
+        return min(self.buffer_seconds, scaled)
+
+    def _grow(self):
+        self.stable_streak = 0
+        self.buffer_seconds = min(AUDIO_BUFFER_MAX_SECONDS, self.buffer_seconds * self.GROW_FACTOR)
+
+    def record_underrun(self):
+        self.underruns += 1
+        self._grow()
+
+    def record_reconnect(self):
+        self.reconnects += 1
+        self._grow()
+
+    def record_stream(self, seconds, had_incident):
+        """Account for a finished stream of `seconds` of audio"""
+        self.streams += 1
+        if had_incident or seconds < self.STABLE_MIN_SECONDS:
+            return
+        self.stable_streak += 1
+        if self.stable_streak >= self.STABLE_STREAMS:
+            self.stable_streak = 0
+            self.buffer_seconds = max(
+                AUDIO_BUFFER_MIN_SECONDS, self.buffer_seconds * self.SHRINK_FACTOR
+            )
+
+    def to_dict(self):
+        return {
+            "buffer_seconds": round(self.buffer_seconds, 3),
+            "streams": self.streams,
+            "underruns": self.underruns,
+            "reconnects": self.reconnects,
+            "stable_streak": self.stable_streak,
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        profile = cls(
+            min(AUDIO_BUFFER_MAX_SECONDS, max(AUDIO_BUFFER_MIN_SECONDS, d["buffer_seconds"]))
+        )
+        profile.streams = d.get("streams", 0)
+        profile.underruns = d.get("underruns", 0)
+        profile.reconnects = d.get("reconnects", 0)
+        profile.stable_streak = d.get("stable_streak", 0)
+        return profile
+
+
+# MediaHostProfile per media_host_key()
+media_host_profiles = {}
+
+
+def media_host_key(media_host):
+    """Collapse a media hostname to its last two labels. CDNs hand out
+    per-node hostnames (e.g. rr3---sn-abc.googlevideo.com) that would
+    otherwise each start from scratch and grow the profile table forever."""
+    if media_host.rsplit(".", 1)[-1].isdigit():
+        return media_host  # an IPv4 address, not a domain
+    return ".".join(media_host.rsplit(".", 2)[-2:])
+
+
+def media_host_profile(media_host):
+    key = media_host_key(media_host)
+    profile = media_host_profiles.get(key)
+    if profile is None:
+        profile = media_host_profiles.setdefault(key, MediaHostProfile())
+    return profile
+
+
+class UpstreamUnavailable(Exception):
+    """Raised instead of contacting a host whose circuit breaker is open"""
+
+    def __init__(self, breaker):
+        self.retry_in = breaker.retry_in()  # seconds until it may be tried again
+        super().__init__(f"{breaker.host} is failing, not retrying for {self.retry_in:.0f}s")
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for one upstream host.
+
+    Closed: every request goes through and its outcome is recorded in a
+    rolling window of the last WINDOW outcomes. Once that window holds at
+    least MIN_FAILURES failures making up FAILURE_RATE of it, the breaker
+    opens: requests fail fast with UpstreamUnavailable for open_seconds,
+    which doubles (up to MAX_OPEN_SECONDS) every time a probe fails. After
+    that it's half-open: a single probe request is let through, and its
+    outcome closes the breaker again or re-opens it.
+
+    Fed from the event loop (extractions) and from FFmpeg threads (stream
+    errors), hence the lock.
+    """
+
+    WINDOW = 20
+    MIN_FAILURES = 5
+    FAILURE_RATE = 0.5
+    OPEN_SECONDS = 30
+    MAX_OPEN_SECONDS = 600
+    # A probe that never reports back (e.g. its caller was cancelled) stops
+    # blocking the next one after this long
+    PROBE_TIMEOUT_SECONDS = 60
+
+    def __init__(self, host):
+        self.host = host
+        self.state = "closed"  # "closed", "open" or "half-open"
+        self.outcomes = deque(maxlen=self.WINDOW)  # True = failure
+        self.open_seconds = self.OPEN_SECONDS
+        self.retry_at = 0.0  # monotonic time an open breaker goes half-open
+        self.probe_started = None
+        self.total_failures = 0
+        self.rejected = 0  # requests failed fast while open
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request to the host may go ahead right now"""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "closed":
+                return True
+            if self.state == "open" and now >= self.retry_at:
+                self.state = "half-open"
+                logging.info(f"Circuit breaker for {self.host} half-open, probing")
+            if self.state == "half-open" and (
+                self.probe_started is None or now - self.probe_started >= self.PROBE_TIMEOUT_SECONDS
+            ):
+                self.probe_started = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.outcomes.append(False)
+            if self.state != "closed":
+                logging.info(f"Circuit breaker for {self.host} closed, upstream recovered")
+                self.state = "closed"
+                self.outcomes.clear()
+                self.open_seconds = self.OPEN_SECONDS
+                self.probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.total_failures += 1
+            self.outcomes.append(True)
+            if self.state == "half-open":
+                self.open_seconds = min(self.MAX_OPEN_SECONDS, self.open_seconds * 2)
+                self._open()
+            elif self.state == "closed":
+                failures = sum(self.outcomes)
+                if failures >= self.MIN_FAILURES and failures >= self.FAILURE_RATE * len(self.outcomes):
+                    self._open()
+
+    def _open(self):
+        self.state = "open"
+        self.probe_started = None
+        self.retry_at = time.monotonic() + self.open_seconds
+        logging.warning(
+            f"Circuit breaker for {self.host} opened after repeated failures; "
+            f"failing fast for {self.open_seconds:g}s"
+        )
+
+    def retry_in(self):
+        """Seconds until an open breaker lets a probe through"""
+        return max(0.0, self.retry_at - time.monotonic()) if self.state == "open" else 0.0
+
+
+# CircuitBreaker per media_host_key() of extractor (page) and media (CDN) hosts
+circuit_breakers = {}
+
+
+def circuit_breaker(host):
+    key = media_host_key(host)
+    breaker = circuit_breakers.get(key)
+    if breaker is None:
+        breaker = circuit_breakers.setdefault(key, CircuitBreaker(key))
+    return breaker
+
+
+def page_host(url):
+    """The extractor-side host of a song's page URL, for its circuit breaker"""
+    return urlsplit(url).hostname or "unknown-host"
+
+
+# FFmpeg stderr line patterns, checked in order; the first match decides the
+# event kind (and its group, if any, the detail). Anything else is "other".
+FFMPEG_EVENT_PATTERNS = (
+    ("reconnect", re.compile(r"Will reconnect at (\d+)")),
+    ("http_error", re.compile(r"(?:HTTP error|Server returned) (\d{3}|\dXX)")),
+    ("connection_error", re.compile(r"Connection (?:refused|timed out|reset)|Network is unreachable")),
+    ("eof", re.compile(r"End of file|Stream ends prematurely")),
+    ("decode_error", re.compile(r"Error while decoding|Invalid data found|[Cc]orrupt|Header missing")),
+)
+# Strips numbers/addresses out of a line so repeats of the "same" message
+# (differing only in byte offsets, pointers, timestamps) dedupe together
+FFMPEG_LINE_NOISE_RE = re.compile(r"0x[0-9a-fA-F]+|\d+")
+# HTTP statuses meaning the resolved stream URL itself is dead (expired
+# signature, removed file) rather than the host having a bad moment
+FFMPEG_DEAD_URL_STATUSES = ("403", "404", "410")
+
+# FFmpeg event kind -> count, per media_host_key(); shown by /upstreams
+ffmpeg_events = {}
+
+
+def parse_ffmpeg_line(line):
+    """Classify one FFmpeg stderr line as (kind, detail)"""
+    for kind, pattern in FFMPEG_EVENT_PATTERNS:
+        match = pattern.search(line)
+        if match:
+            return kind, match.group(1) if pattern.groups else None
+    return "other", None
+
+
 class FFmpegStderrLogger:
-    """File-like sink that gives FFmpeg stderr lines normal application logs.
+    """File-like sink that turns FFmpeg stderr into structured events.
 
     discord.py recognises a file-like object without ``fileno()`` and pipes
-    FFmpeg's stderr to its ``write`` method in a reader thread.  That avoids
-    FFmpeg writing directly to the container's stdout/stderr without the
-    logging formatter (and therefore without timestamps).
+    FFmpeg's stderr to its ``write`` method in a reader thread.  Each line
+    is classified by parse_ffmpeg_line() and counted per stream (and per
+    media host in ffmpeg_events): reconnects grow the host's read-ahead
+    buffer, HTTP/connection errors count against its circuit breaker (once
+    per stream, and not for a dead-URL status), and a dead-URL status drops the cached stream URL so the next attempt
+    re-resolves it.
+
+    Lines still reach the application log, with timestamps (unlike FFmpeg
+    writing to the container's stderr directly), but a line repeating
+    within LOG_WINDOW_SECONDS is only counted and at most
+    MAX_LINES_PER_WINDOW lines are logged per window. A summary of the
+    stream's events is logged when it ends.
     """
 
-    def __init__(self, media_host):
+    LOG_WINDOW_SECONDS = 30
+    MAX_LINES_PER_WINDOW = 20
+
+    def __init__(self, media_host, page_url=None):
         self.media_host = media_host
-        self._pending = ""
+        self.page_url = page_url  # the song's page URL, keying resolved_streams
+        self.counts = {}  # event kind -> count for this stream
+        self.http_errors = {}  # HTTP status -> count for this stream
+        self._host_counts = ffmpeg_events.setdefault(media_host_key(media_host), {})
+        self._pending = b""
+        self._failure_recorded = False  # counted against the circuit breaker yet
+        self._last_logged = {}  # normalised line -> monotonic time logged
+        self._suppressed = {}  # normalised line -> repeats not logged since
+        self._window_start = 0.0
+        self._window_lines = 0
 
     def write(self, data):
-        text = data.decode("utf-8", errors="replace") if isinstance(data, bytes) else str(data)
-        self._pending += text
-        lines = self._pending.splitlines(keepends=True)
-        self._pending = ""
+        if isinstance(data, str):
+            data = data.encode()
+        size = len(data)
+        if self._pending:
+            data = self._pending + data
+            self._pending = b""
+        lines = data.splitlines(keepends=True)
+        if lines and not lines[-1].endswith((b"\n", b"\r")):
+            self._pending = lines.pop()
         for line in lines:
-            if line.endswith(("\n", "\r")):
-                ffmpeg_logger.warning("[%s] %s", self.media_host, line.rstrip())
-            else:
-                self._pending = line
-        return len(data)
+            self._handle(line.decode("utf-8", errors="replace").rstrip())
+        return size
+
+    def _handle(self, line):
+        if not line:
+            return
+        kind, detail = parse_ffmpeg_line(line)
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        self._host_counts[kind] = self._host_counts.get(kind, 0) + 1
+        if kind == "reconnect":
+            media_host_profile(self.media_host).record_reconnect()
+        elif (
+            kind == "connection_error" or kind == "http_error" and detail not in FFMPEG_DEAD_URL_STATUSES
+        ) and not self._failure_recorded:
+            # Once per stream, like the success record_delivery() makes of it;
+            # a dead URL says nothing about the host's health
+            self._failure_recorded = True
+            circuit_breaker(self.media_host).record_failure()
+        if kind == "http_error":
+            self.http_errors[detail] = self.http_errors.get(detail, 0) + 1
+            if detail in FFMPEG_DEAD_URL_STATUSES and self.page_url:
+                resolved_streams.pop(self.page_url, None)
+        self._log(kind, line)
+
+    def _log(self, kind, line):
+        # FFmpeg's own -loglevel keeps normal output to warnings and errors;
+        # the chatter -loglevel verbose adds in debug mode stays at DEBUG.
+        level = logging.DEBUG if kind == "other" and LOG_LEVEL <= logging.DEBUG else logging.WARNING
+        if not ffmpeg_logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        if now - self._window_start >= self.LOG_WINDOW_SECONDS:
+            self._window_start = now
+            self._window_lines = 0
+        key = FFMPEG_LINE_NOISE_RE.sub("#", line)
+        last = self._last_logged.get(key)
+        if (
+            last is not None and now - last < self.LOG_WINDOW_SECONDS
+        ) or self._window_lines >= self.MAX_LINES_PER_WINDOW:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+        if len(self._last_logged) >= 256:
+            self._last_logged.clear()
+        self._last_logged[key] = now
+        self._window_lines += 1
+        repeated = self._suppressed.pop(key, 0)
+        suffix = f" (repeated {repeated} more times)" if repeated else ""
+        ffmpeg_logger.log(level, "[%s] %s%s", self.media_host, line, suffix)
 
     def flush(self):
         if self._pending:
-            ffmpeg_logger.warning("[%s] %s", self.media_host, self._pending)
-            self._pending = ""
+            self._handle(self._pending.decode("utf-8", errors="replace").rstrip())
+            self._pending = b""
+        events = {kind: n for kind, n in self.counts.items() if kind != "other"}
+        suppressed = sum(self._suppressed.values())
+        self._suppressed.clear()
+        if not (events or suppressed):
+            return
+        summary = ", ".join(f"{n} {kind}" for kind, n in sorted(events.items()))
+        if self.http_errors:
+            statuses = ", ".join(f"{status}×{n}" for status, n in sorted(self.http_errors.items()))
+            summary += f" (HTTP {statuses})"
+        if suppressed:
+            summary += f"{'; ' if summary else ''}{suppressed} repeated line(s) not logged"
+        ffmpeg_logger.info("[%s] Stream events: %s", self.media_host, summary)
+
+
+class PipeMultiplexer:
+    """A single selector thread reading every FFmpeg stdout/stderr pipe.
+
+    Keeps the thread count flat however many guilds are streaming, instead
+    of a stderr reader thread plus a PCM read-ahead thread per stream.
+    Registered pipes are switched to non-blocking and read READ_SIZE bytes
+    at a time; each chunk is handed to the pipe's on_data callback, and EOF
+    (or a read error) to its on_eof. Both run on the multiplexer thread, so
+    they must never block. Selector changes requested from other threads
+    are queued and applied by the multiplexer thread itself, woken through
+    a self-pipe.
+    """
+
+    READ_SIZE = 65536  # a whole Linux pipe buffer per read()
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._handlers = {}  # fd -> (on_data, on_eof), watched or paused
+        self._commands = deque()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+
+    @property
+    def watched(self):
+        """Number of pipes currently registered (paused ones included)"""
+        return len(self._handlers)
+
+    def add_reader(self, pipe, on_data, on_eof):
+        """Start reading `pipe`; returns its fd, the handle for pause(),
+        resume() and remove()"""
+        fd = pipe.fileno()
+        os.set_blocking(fd, False)
+
+        def register():
+            self._handlers[fd] = (on_data, on_eof)
+            self._selector.register(fd, selectors.EVENT_READ)
+
+        self._call(register)
+        return fd
+
+    def pause(self, fd):
+        """Stop reading fd for now (backpressure: the writer then blocks)"""
+
+        def unregister():
+            if fd in self._handlers:
+                try:
+                    self._selector.unregister(fd)
+                except KeyError:
+                    pass  # already paused
+
+        self._call(unregister)
+
+    def resume(self, fd):
+        def register():
+            if fd in self._handlers:
+                try:
+                    self._selector.register(fd, selectors.EVENT_READ)
+                except KeyError:
+                    pass  # wasn't paused
+
+        self._call(register)
+
+    def remove(self, fd, timeout=1.0):
+        """Forget fd, waiting until the multiplexer thread has let go of it
+        so the caller can safely close the pipe (and the fd be reused)"""
+        done = threading.Event()
+
+        def drop():
+            self._drop(fd)
+            done.set()
+
+        self._call(drop)
+        done.wait(timeout)
+
+    def _drop(self, fd):
+        if self._handlers.pop(fd, None) is not None:
+            try:
+                self._selector.unregister(fd)
+            except KeyError:
+                pass  # was paused
+
+    def _call(self, command):
+        if threading.current_thread() is self._thread:
+            command()
+            return
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, daemon=True, name="jukebox-pipe-mux"
+                    )
+                    self._thread.start()
+        self._commands.append(command)
+        try:
+            os.write(self._wakeup_w, b"\0")
+        except BlockingIOError:
+            pass  # a wakeup is already pending
+
+    def _run(self):
+        while True:
+            for key, _ in self._selector.select():
+                fd = key.fd
+                if fd == self._wakeup_r:
+                    self._run_commands()
+                    continue
+                handler = self._handlers.get(fd)
+                if handler is None:
+                    continue  # removed earlier in this batch
+                on_data, on_eof = handler
+                try:
+                    data = os.read(fd, self.READ_SIZE)
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    data = b""
+                try:
+                    if data:
+                        on_data(data)
+                    else:
+                        self._drop(fd)
+                        on_eof()
+                except Exception:
+                    logging.exception("FFmpeg pipe handler failed; no longer reading it")
+                    self._drop(fd)
+
+    def _run_commands(self):
+        try:
+            while os.read(self._wakeup_r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        while self._commands:
+            try:
+                self._commands.popleft()()
+            except (OSError, ValueError):
+                # e.g. registering a pipe that was already closed again
+                logging.debug("Ignoring pipe multiplexer command on a closed pipe", exc_info=True)
+
+
+pipe_multiplexer = PipeMultiplexer()
 
 
 class TimestampedFFmpegPCMAudio(discord.FFmpegPCMAudio):
-    """Read FFmpeg stderr per line rather than discord.py's 8 KiB chunks."""
+    """FFmpegPCMAudio whose stderr is read by the shared PipeMultiplexer
+    (and so reaches FFmpegStderrLogger) instead of by a thread per process."""
+
+    def __init__(self, *args, media_host="unknown-media-host", **kwargs):
+        self.media_host = media_host
+        self._delivered = False
+        self._stderr_fd = None
+        super().__init__(*args, **kwargs)
+
+    def record_delivery(self):
+        """Audio is flowing: the media host answered this request fine"""
+        if not self._delivered:
+            self._delivered = True
+            circuit_breaker(self.media_host).record_success()
+
+    def read(self):
+        frame = super().read()
+        if frame:
+            self.record_delivery()
+        return frame
 
     def _pipe_reader(self, dest):
-        while self._process:
-            if self._stderr is None:
-                break
-            try:
-                line = self._stderr.readline()
-            except Exception:
-                ffmpeg_logger.exception("Unable to read FFmpeg stderr")
-                dest.flush()
-                return
-            if not line:
-                break
-            dest.write(line)
-        dest.flush()
+        # discord.py still starts a thread for this; hand the pipe to the
+        # multiplexer and let that thread end right away.
+        stderr = self._stderr
+        if not stderr or not self._process:
+            return  # already cleaned up
+        try:
+            self._stderr_fd = pipe_multiplexer.add_reader(stderr, dest.write, dest.flush)
+        except (OSError, ValueError):
+            pass  # closed meanwhile
+
+    def cleanup(self):
+        if self._stderr_fd is not None:
+            pipe_multiplexer.remove(self._stderr_fd)
+            self._stderr_fd = None
+        super().cleanup()
 
 
 class BufferedPCMAudio(discord.AudioSource):
-    """Read PCM from an FFmpeg source ahead of Discord's voice send loop."""
+    """Read PCM from an FFmpeg source ahead of Discord's voice send loop.
+
+    The FFmpeg stdout pipe is read by the shared PipeMultiplexer. When the
+    buffer is full the pipe is paused (FFmpeg then blocks writing to it)
+    until read() has drained RESUME_SLACK_FRAMES frames again.
+    """
 
     FRAME_BYTES = 3840  # 20 ms of 48 kHz, stereo, signed 16-bit PCM
     FRAME_SECONDS = 0.02
+    RESUME_SLACK_FRAMES = 25
 
-    def __init__(self, source, buffer_seconds, startup_seconds):
+    def __init__(self, source, buffer_seconds, startup_seconds, profile=None, start_seconds=0):
         self.source = source
-        self._stop = threading.Event()
+        self.profile = profile  # MediaHostProfile to feed and grow, if any
         self._eof = threading.Event()
         self._ready = threading.Event()
         self._underrun = False
-        max_frames = max(1, int(buffer_seconds / self.FRAME_SECONDS))
+        self._had_incident = False
+        self._reconnects_at_start = profile.reconnects if profile else 0
+        self.start_seconds = start_seconds  # where FFmpeg's -ss put frame 0
+        self._frames_played = 0  # net of seeks; silence isn't counted
+        # Read-ahead frames, frames already played (for rewinding) and frames
+        # rewound over that read() must serve again before the read-ahead
+        # ones. All only touched under _lock, shared by the multiplexer
+        # thread, read() and seek_by().
+        self._lock = threading.Lock()
+        self._frames = deque()
+        self._history = deque(maxlen=int(AUDIO_SEEK_HISTORY_SECONDS / self.FRAME_SECONDS))
+        self._replay = deque()
+        self._capacity = self.frames_for(buffer_seconds)
         self._startup_frames = min(
-            max_frames, int(startup_seconds / self.FRAME_SECONDS + 0.999999)
+            self._capacity, int(startup_seconds / self.FRAME_SECONDS + 0.999999)
         )
-        self._frames = thread_queue.Queue(maxsize=max_frames)
-        self._reader = threading.Thread(
-            target=self._read_ahead,
-            daemon=True,
-            name="jukebox-pcm-read-ahead",
-        )
-        self._reader.start()
-
-    def _read_ahead(self):
-        try:
-            while not self._stop.is_set():
-                frame = self.source.read()
-                if not frame:
-                    break
-                while not self._stop.is_set():
-                    try:
-                        self._frames.put(frame, timeout=0.1)
-                        break
-                    except thread_queue.Full:
-                        pass
-                if self._frames.qsize() >= self._startup_frames:
-                    self._ready.set()
-        except Exception:
-            logging.exception("PCM read-ahead buffer stopped unexpectedly")
-        finally:
-            self._eof.set()
+        self._partial = bytearray()  # bytes short of a whole frame
+        self._paused = False
+        self._pipe_fd = pipe_multiplexer.add_reader(source._stdout, self._on_data, self._on_eof)
+
+    def _on_data(self, data):
+        """Multiplexer thread: slice a chunk of FFmpeg stdout into frames"""
+        partial = self._partial
+        partial += data
+        count = len(partial) // self.FRAME_BYTES
+        if not count:
+            return
+        frames = [
+            bytes(partial[i:i + self.FRAME_BYTES])
+            for i in range(0, count * self.FRAME_BYTES, self.FRAME_BYTES)
+        ]
+        del partial[:count * self.FRAME_BYTES]
+        with self._lock:
+            self._frames.extend(frames)
+            buffered = len(self._frames)
+            full = buffered >= self._capacity
+            if full:
+                self._paused = True
+        if full:
+            pipe_multiplexer.pause(self._pipe_fd)
+        if buffered >= self._startup_frames:
             self._ready.set()
+        self.source.record_delivery()
+
+    def _on_eof(self):
+        """Multiplexer thread: FFmpeg closed stdout (a trailing partial frame
+        is dropped, like FFmpegPCMAudio.read does)"""
+        self._eof.set()
+        self._ready.set()
+
+    def _resume_threshold(self):
+        return self._capacity - min(self.RESUME_SLACK_FRAMES, self._capacity // 2)
 
     def read(self):
-        try:
-            # AudioPlayer keeps its own 20 ms clock and catches up if read()
-            # blocks. Never wait here: an empty buffer must yield silence, not
-            # make Discord send subsequent frames in a burst.
-            frame = self._frames.get_nowait()
-        except thread_queue.Empty:
+        resume = False
+        with self._lock:
+            if self._replay:
+                frame = self._replay.popleft()
+            elif self._frames:
+                frame = self._frames.popleft()
+            else:
+                # AudioPlayer keeps its own 20 ms clock and catches up if
+                # read() blocks. Never wait here: an empty buffer must yield
+                # silence, not make Discord send subsequent frames in a burst.
+                frame = None
+            if frame is not None:
+                self._history.append(frame)
+                self._frames_played += 1
+                if self._paused and len(self._frames) <= self._resume_threshold():
+                    self._paused = False
+                    resume = True
+        if resume:
+            pipe_multiplexer.resume(self._pipe_fd)
+        if frame is None:
             if self._eof.is_set():
                 return b""
             if not self._underrun:
                 logging.warning("PCM read-ahead buffer underrun; sending silence")
                 self._underrun = True
+                self._had_incident = True
+                if self.profile:
+                    self.profile.record_underrun()
+                    # Deepen this stream's buffer too, not just the next one's
+                    self._capacity = max(
+                        self._capacity, self.frames_for(self.profile.buffer_seconds)
+                    )
             return b"\0" * self.FRAME_BYTES
         if self._underrun:
             logging.info("PCM read-ahead buffer recovered")
             self._underrun = False
         return frame
 
+    @property
+    def position(self):
+        """Seconds into the track of the next frame read() will return"""
+        return self.start_seconds + self._frames_played * self.FRAME_SECONDS
+
+    def seek_by(self, seconds):
+        """Move playback by `seconds` without touching FFmpeg: backwards
+        through the retained history window, forwards through frames already
+        read ahead. Returns False, leaving playback untouched, when the
+        target lies outside what's in memory."""
+        frames = round(seconds / self.FRAME_SECONDS)
+        resume = False
+        with self._lock:
+            if frames < 0:
+                if -frames > len(self._history):
+                    return False
+                for _ in range(-frames):
+                    self._replay.appendleft(self._history.pop())
+            elif frames > 0:
+                if frames > len(self._replay) + len(self._frames):
+                    return False
+                for _ in range(frames):
+                    frame = self._replay.popleft() if self._replay else self._frames.popleft()
+                    self._history.append(frame)
+                if self._paused and len(self._frames) <= self._resume_threshold():
+                    self._paused = False
+                    resume = True
+            self._frames_played += frames
+        if resume:
+            pipe_multiplexer.resume(self._pipe_fd)
+        return True
+
+    @classmethod
+    def frames_for(cls, buffer_seconds):
+        return max(1, int(buffer_seconds / cls.FRAME_SECONDS))
+
+    @property
+    def underrun(self):
+        """True while read() is substituting silence for missing frames."""
+        return self._underrun
+
     def wait_until_ready(self):
         """Block only before VoiceClient.play starts its 20 ms clock."""
         self._ready.wait()
 
     def cleanup(self):
-        self._stop.set()
+        # Runs again from __del__ once the source is garbage collected, by
+        # which time the fd number may belong to another stream's pipe.
+        if self._pipe_fd is None:
+            return
+        pipe_multiplexer.remove(self._pipe_fd)
+        self._pipe_fd = None
+        self._eof.set()
+        self._ready.set()
+        if self.profile:
+            reconnected = self.profile.reconnects != self._reconnects_at_start
+            self.profile.record_stream(
+                self._frames_played * self.FRAME_SECONDS, self._had_incident or reconnected
+            )
+        self.source.cleanup()
+
+
+class Histogram:
+    """Fixed-bucket counter: bucket i counts values <= bounds[i], the last
+    bucket everything above the largest bound."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+
+    def format(self, unit="ms"):
+        """One 'bound:count' pair per non-empty bucket, e.g. '≤1ms:40 >20ms:2'"""
+        labels = [f"≤{b:g}{unit}" for b in self.bounds] + [f">{self.bounds[-1]:g}{unit}"]
+        parts = [f"{label}:{count}" for label, count in zip(labels, self.counts) if count]
+        return " ".join(parts) or "-"
+
+
+class VoiceSendStats:
+    """Per-guild voice-send timing, fed by InstrumentedAudioSource.
+
+    Counters only ever grow for the lifetime of the process; they're plain
+    ints updated from the single AudioPlayer thread of the guild and read
+    from the event loop, so no locking is needed."""
+
+    READ_BOUNDS_MS = (0.05, 0.2, 1, 5, 20)
+    # AudioPlayer targets one read every 20 ms; intervals well below that are
+    # catch-up bursts after a late frame, well above it are stalls.
+    INTERVAL_BOUNDS_MS = (5, 15, 18, 22, 25, 40, 100)
+    BURST_MS = 5
+    RECONNECT_BOUNDS_MS = (500, 1000, 2000, 5000, 10000)
+
+    def __init__(self):
+        self.frames = 0
+        self.silence_frames = 0
+        self.underrun_streaks = 0
+        self.longest_underrun = 0  # in frames
+        self.bursts = 0
+        self.jitter_ms_total = 0.0  # sum of |interval - 20 ms|
+        self.intervals = 0
+        self.max_read_ms = 0.0
+        self.max_interval_ms = 0.0
+        self.last_drift_ms = 0.0  # wall clock minus audio clock, last track
+        self.read_ms = Histogram(self.READ_BOUNDS_MS)
+        self.interval_ms = Histogram(self.INTERVAL_BOUNDS_MS)
+        # Dropped-from-voice recoveries (see reconnect_voice), timed from the
+        # disconnect to audio playing again
+        self.reconnects = 0
+        self.reconnect_failures = 0
+        self.reconnect_ms = Histogram(self.RECONNECT_BOUNDS_MS)
+        self.last_reconnect_ms = 0.0
+
+    def record_read(self, read_ms, silence):
+        self.frames += 1
+        self.read_ms.add(read_ms)
+        if read_ms > self.max_read_ms:
+            self.max_read_ms = read_ms
+        if silence:
+            self.silence_frames += 1
+
+    def record_interval(self, interval_ms):
+        self.intervals += 1
+        self.interval_ms.add(interval_ms)
+        self.jitter_ms_total += abs(interval_ms - BufferedPCMAudio.FRAME_SECONDS * 1000)
+        if interval_ms < self.BURST_MS:
+            self.bursts += 1
+        if interval_ms > self.max_interval_ms:
+            self.max_interval_ms = interval_ms
+
+    def record_underrun(self, frames):
+        self.underrun_streaks += 1
+        if frames > self.longest_underrun:
+            self.longest_underrun = frames
+
+    def record_reconnect(self, reconnect_ms):
+        self.reconnects += 1
+        self.reconnect_ms.add(reconnect_ms)
+        self.last_reconnect_ms = reconnect_ms
+
+    @property
+    def mean_jitter_ms(self):
+        return self.jitter_ms_total / self.intervals if self.intervals else 0.0
+
+    def summary(self):
+        """One-line digest for the logs"""
+        return (
+            f"{self.frames} frames, jitter {self.mean_jitter_ms:.2f} ms avg / "
+            f"{self.max_interval_ms:.1f} ms max interval, {self.bursts} catch-up bursts, "
+            f"read {self.max_read_ms:.2f} ms max, {self.underrun_streaks} underruns "
+            f"(longest {self.longest_underrun * BufferedPCMAudio.FRAME_SECONDS:.2f}s, "
+            f"{self.silence_frames * BufferedPCMAudio.FRAME_SECONDS:.2f}s silence total), "
+            f"drift {self.last_drift_ms:+.0f} ms"
+        )
+
+
+# Voice-send stats per guild id, shown by /audiostats
+voice_send_stats = {}
+
+
+class InstrumentedAudioSource(discord.AudioSource):
+    """Time every read() Discord's AudioPlayer makes on the wrapped source.
+
+    Records how long each read takes, the interval between consecutive reads
+    (jitter and catch-up bursts of the player's 20 ms clock), and the silence
+    BufferedPCMAudio substitutes on underrun, into the guild's VoiceSendStats.
+    Costs two perf_counter() calls per 20 ms frame.
+    """
+
+    # A gap this long between reads is a pause/resume, not send jitter; it
+    # restarts the drift clock instead of being recorded as an interval.
+    PAUSE_GAP_SECONDS = 1.0
+
+    def __init__(self, source, stats, guild_id):
+        self.source = source
+        self.stats = stats
+        self.guild_id = guild_id
+        self._last_read = None
+        self._clock_start = None
+        self._track_frames = 0
+        self._underrun_streak = 0
+
+    def read(self):
+        started = time.perf_counter()
+        if self._last_read is None:
+            self._clock_start = started
+        else:
+            interval = started - self._last_read
+            if interval >= self.PAUSE_GAP_SECONDS:
+                self._clock_start += interval
+            else:
+                self.stats.record_interval(interval * 1000)
+        self._last_read = started
+
+        frame = self.source.read()
+        if not frame:
+            return frame  # end of stream
+        silence = getattr(self.source, "underrun", False)
+        self.stats.record_read((time.perf_counter() - started) * 1000, silence)
+        self._track_frames += 1
+        if silence:
+            self._underrun_streak += 1
+        elif self._underrun_streak:
+            self.stats.record_underrun(self._underrun_streak)
+            self._underrun_streak = 0
+        return frame
+
+    def cleanup(self):
+        if self._underrun_streak:
+            self.stats.record_underrun(self._underrun_streak)
+            self._underrun_streak = 0
+        if self._last_read is not None:
+            # The last read's own frame hasn't been "played" yet when it starts
+            audio_seconds = max(self._track_frames - 1, 0) * BufferedPCMAudio.FRAME_SECONDS
+            self.stats.last_drift_ms = (self._last_read - self._clock_start - audio_seconds) * 1000
+        logging.info("Voice send stats for guild %s: %s", self.guild_id, self.stats.summary())
         self.source.cleanup()
 
 
-async def get_audio_source(url):
-    """Extract audio URL for streaming"""
+# Resolved media stream URLs, keyed by the song's page URL, so re-opening a
+# song shortly after it was resolved (/seek, loop replays) skips yt-dlp.
+# Signed CDN URLs carry their own expiry (e.g. YouTube's `expire=` query
+# parameter); anything else is trusted for STREAM_URL_TTL seconds.
+STREAM_URL_TTL = 600
+STREAM_URL_EXPIRY_MARGIN = 60  # stop reusing a URL this long before it expires
+STREAM_CACHE_LIMIT = 256
+resolved_streams = {}
+
+# advance_queue resolves this many upcoming songs at once and plays the first
+# that works, so a run of dead links is skipped in one round trip. URLs that
+# failed are skipped outright, without another extraction, for
+# FAILED_URL_TTL seconds.
+SKIP_AHEAD_CANDIDATES = 3
+FAILED_URL_TTL = 600
+# A queue held up by an open circuit breaker retries no sooner than this
+UPSTREAM_RETRY_MIN_SECONDS = 5
+failed_urls = {}  # url -> time.monotonic() the failure is forgotten at
+
+
+def stream_expiry(stream_url):
+    """Wall-clock time after which a resolved stream URL shouldn't be reused"""
+    now = time.time()
+    try:
+        expires = float(parse_qs(urlsplit(stream_url).query)["expire"][0])
+    except (KeyError, ValueError):
+        return now + STREAM_URL_TTL
+    return expires - STREAM_URL_EXPIRY_MARGIN
+
+
+async def run_extraction(url, extract, executor=None):
+    """Run a blocking yt-dlp call for `url` on `executor`, guarded by the
+    circuit breaker of the URL's host: fails fast with UpstreamUnavailable
+    while the breaker is open, and feeds the outcome back to it. Errors
+    yt-dlp flags as expected (a removed or private video) say nothing about
+    the host's health and aren't counted."""
+    breaker = circuit_breaker(page_host(url))
+    if not breaker.allow():
+        raise UpstreamUnavailable(breaker)
     loop = asyncio.get_running_loop()
     try:
-        data = await loop.run_in_executor(
-            None, lambda: new_audio_extractor().extract_info(url, download=False)
-        )
-        if "entries" in data:
-            data = data["entries"][0]
+        result = await loop.run_in_executor(executor, extract)
+    except Exception as e:
+        if not is_permanent_extraction_error(e):
+            breaker.record_failure()
+        raise
+    breaker.record_success()
+    return result
+
+
+async def resolve_stream(url, executor=None):
+    """Resolve a song's page URL to its playable media stream.
+
+    Returns a dict with the stream `url`, its `http_headers`, `media_host`
+    and `expires_at`, reusing a cached resolution while it's still valid.
+    Cache warming passes background_executor so it never queues ahead of
+    extractions someone is waiting on.
+    """
+    stream = resolved_streams.get(url)
+    if stream and stream["expires_at"] > time.time():
+        return stream
+
+    data = await run_extraction(
+        url, lambda: new_audio_extractor().extract_info(url, download=False), executor
+    )
+    if "entries" in data:
+        data = data["entries"][0]
+    stream = {
+        "url": data["url"],
+        "http_headers": data.get("http_headers"),
+        "media_host": urlsplit(data["url"]).hostname or "unknown-media-host",
+        "expires_at": stream_expiry(data["url"]),
+    }
+    # Re-insert so dict order stays least-recently-resolved first
+    resolved_streams.pop(url, None)
+    resolved_streams[url] = stream
+    while len(resolved_streams) > STREAM_CACHE_LIMIT:
+        del resolved_streams[next(iter(resolved_streams))]
+    return stream
+
+
+async def get_audio_source(url, start_seconds=0):
+    """Open an FFmpeg PCM stream for a song, optionally starting
+    `start_seconds` in (FFmpeg input seek, so nothing before it is fetched)"""
+    try:
+        stream = await resolve_stream(url)
+        breaker = circuit_breaker(stream["media_host"])
+        if not breaker.allow():
+            raise UpstreamUnavailable(breaker)
         source_options = dict(ffmpeg_options)
-        source_options["before_options"] = ffmpeg_before_options(
-            data.get("http_headers")
-        )
-        media_host = urlsplit(data["url"]).hostname or "unknown-media-host"
+        source_options["before_options"] = ffmpeg_before_options(stream["http_headers"])
+        if start_seconds > 0:
+            source_options["before_options"] += f" -ss {start_seconds:.3f}"
+        media_host = stream["media_host"]
         ffmpeg_logger.info("Starting FFmpeg media stream from %s", media_host)
         return TimestampedFFmpegPCMAudio(
-            data["url"], stderr=FFmpegStderrLogger(media_host), **source_options
+            stream["url"],
+            stderr=FFmpegStderrLogger(media_host, page_url=url),
+            media_host=media_host,
+            **source_options,
         )
+    except UpstreamUnavailable:
+        raise
     except Exception as e:
         raise Exception(f"Error extracting audio from URL: {e}")
 
 
 class YTDLSource(discord.PCMVolumeTransformer):
-    def __init__(self, source, volume=0.5):
+    def __init__(self, source, volume=0.5, buffer=None, start_seconds=0):
         super().__init__(source, volume)
+        self.buffer = buffer  # the BufferedPCMAudio in the chain, if enabled
+        self.start_seconds = start_seconds
+        self._frames_read = 0  # position source when there's no buffer
+        self.parked = False  # Kept open across a voice reconnect (see park_source)
+
+    def read(self):
+        frame = super().read()
+        if frame:
+            self._frames_read += 1
+        return frame
+
+    def cleanup(self):
+        # AudioPlayer cleans its source up as soon as playback stops, which
+        # would kill FFmpeg and the read-ahead buffer of a parked source
+        if not self.parked:
+            super().cleanup()
+
+    def release(self):
+        """Clean up a parked source that won't be played any further"""
+        self.parked = False
+        self.cleanup()
+
+    @property
+    def position(self):
+        """Seconds into the track, from the frames actually handed to Discord"""
+        if self.buffer:
+            return self.buffer.position
+        return self.start_seconds + self._frames_read * BufferedPCMAudio.FRAME_SECONDS
 
     @classmethod
-    async def from_url(cls, url, guild_id):
-        source = await get_audio_source(url)
+    async def from_url(cls, url, guild_id, start_seconds=0):
+        source = await get_audio_source(url, start_seconds)
+        buffer = None
         if AUDIO_BUFFER_SECONDS > 0:
-            source = BufferedPCMAudio(
-                source, AUDIO_BUFFER_SECONDS, AUDIO_BUFFER_STARTUP_SECONDS
+            profile = media_host_profile(source.media_host)
+            source = buffer = BufferedPCMAudio(
+                source,
+                profile.buffer_seconds,
+                profile.startup_seconds,
+                profile=profile,
+                start_seconds=start_seconds,
             )
-            if AUDIO_BUFFER_STARTUP_SECONDS > 0:
+            if profile.startup_seconds > 0:
                 await asyncio.to_thread(source.wait_until_ready)
+        stats = voice_send_stats.setdefault(guild_id, VoiceSendStats())
+        source = InstrumentedAudioSource(source, stats, guild_id)
         queue = get_queue(guild_id)
-        return cls(source, volume=queue.get_volume())
+        return cls(source, volume=queue.get_volume(), buffer=buffer, start_seconds=start_seconds)
+
+
+def song_requester_id(song):
+    return getattr(song["requester"], "id", None)
+
+
+class FairQueue:
+    """Play order for fair-queue mode, usable where MusicQueue.queue is
+    otherwise a deque (len, iteration, [i], append, appendleft, popleft,
+    extend, extendleft, clear).
+
+    Songs sit in one lane per requester; popleft() takes the next song of
+    the requester whose turn it is and sends them to the back of `turns`,
+    so picking the next song is O(1) however long anyone's lane is.
+    Songs placed explicitly (appendleft: /playnext, /playnow, /previous,
+    or /move to the front) go in the `pinned` lane, which plays before the
+    rotation. Iterating yields the interleaved play order, which /queue,
+    /move and /remove positions refer to."""
+
+    def __init__(self, songs=()):
+        self.pinned = deque()
+        self.lanes = {}  # requester id -> deque of that requester's songs
+        self.turns = deque()  # requester ids with songs; next turn first
+        self._length = 0
+        self.extend(songs)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        yield from self.pinned
+        yield from self._rotation()
+
+    def _rotation(self):
+        lanes = deque(iter(self.lanes[requester_id]) for requester_id in self.turns)
+        while lanes:
+            lane = lanes.popleft()
+            for song in lane:
+                yield song
+                lanes.append(lane)
+                break
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("queue index out of range")
+        return next(itertools.islice(self, index, None))
+
+    def append(self, song):
+        requester_id = song_requester_id(song)
+        lane = self.lanes.get(requester_id)
+        if lane is None:
+            lane = self.lanes[requester_id] = deque()
+            self.turns.append(requester_id)
+        lane.append(song)
+        self._length += 1
+
+    def appendleft(self, song):
+        self.pinned.appendleft(song)
+        self._length += 1
+
+    def extend(self, songs):
+        for song in songs:
+            self.append(song)
+
+    def extendleft(self, songs):
+        for song in songs:
+            self.appendleft(song)
+
+    def popleft(self):
+        if self.pinned:
+            song = self.pinned.popleft()
+        elif self.turns:
+            requester_id = self.turns[0]
+            lane = self.lanes[requester_id]
+            song = lane.popleft()
+            if lane:
+                self.turns.rotate(-1)
+            else:
+                self.turns.popleft()
+                del self.lanes[requester_id]
+        else:
+            raise IndexError("pop from an empty queue")
+        self._length -= 1
+        return song
+
+    def clear(self):
+        self.pinned.clear()
+        self.lanes.clear()
+        self.turns.clear()
+        self._length = 0
+
+    def remove(self, song):
+        """Remove `song` by identity; True if it was queued"""
+        requester_id = song_requester_id(song)
+        for lane in (self.pinned, self.lanes.get(requester_id, ())):
+            for i, queued in enumerate(lane):
+                if queued is song:
+                    del lane[i]
+                    self._length -= 1
+                    if lane is not self.pinned and not lane:
+                        del self.lanes[requester_id]
+                        self.turns.remove(requester_id)
+                    return True
+        return False
+
+    def insert(self, index, song):
+        """Put `song` at play position `index` if that's within the pinned
+        lane, else as near as its requester's turns allow: among their own
+        songs, after those that come before `index` now"""
+        if index <= len(self.pinned):
+            self.pinned.insert(index, song)
+            self._length += 1
+            return
+        requester_id = song_requester_id(song)
+        earlier = sum(
+            1
+            for queued in itertools.islice(self._rotation(), index - len(self.pinned))
+            if song_requester_id(queued) == requester_id
+        )
+        self.append(song)
+        lane = self.lanes[requester_id]
+        if earlier < len(lane) - 1:
+            lane.pop()
+            lane.insert(earlier, song)
+
+    def shuffle(self):
+        """Shuffle within each lane and the order of turns"""
+        for lane in (self.pinned, *self.lanes.values()):
+            songs = list(lane)
+            random.shuffle(songs)
+            lane.clear()
+            lane.extend(songs)
+        random.shuffle(self.turns)
+
+
+class ShuffledQueue:
+    """Play order for shuffle-play mode, deque-like in the same way as
+    FairQueue.
+
+    Songs live in one list whose front part is the order decided so far;
+    the rest is unordered. Whenever another position is needed - popleft(),
+    or peeking ahead as /queue does - one Fisher-Yates step draws it from
+    the unordered rest, so no shuffled copy is ever built and a preview is
+    exactly what will play. Songs coming around again under loop_mode
+    "queue" (requeue()) wait behind the current cycle and are drawn once it
+    has played out, so each cycle gets a fresh order. A draw that would
+    repeat the song just before it is redrawn when there's a choice."""
+
+    COMPACT_MIN = 64  # played slots tolerated at the front before trimming
+
+    def __init__(self, songs=(), decided=0):
+        self._songs = list(songs)
+        self._start = 0  # _songs[:_start] are played-out slots
+        self._decided = min(decided, len(self._songs))  # end of the fixed order
+        self._cycle_end = len(self._songs)  # _songs[_cycle_end:] is the next cycle
+        self._last_url = None  # last song popped, so it isn't drawn right again
+
+    def __len__(self):
+        return len(self._songs) - self._start
+
+    def _decide(self):
+        """Draw the song for the next undecided position; False if there
+        are none left"""
+        songs = self._songs
+        i = self._decided
+        if i == len(songs):
+            return False
+        if i == self._cycle_end:
+            self._cycle_end = len(songs)  # the next cycle starts here
+        j = random.randrange(i, self._cycle_end)
+        previous = songs[i - 1]["url"] if i > self._start else self._last_url
+        if songs[j]["url"] == previous and self._cycle_end - i > 1:
+            k = random.randrange(i, self._cycle_end - 1)
+            j = k + 1 if k >= j else k
+        songs[i], songs[j] = songs[j], songs[i]
+        self._decided += 1
+        return True
+
+    def __iter__(self):
+        i = self._start
+        while i < len(self._songs):
+            if i == self._decided:
+                self._decide()
+            yield self._songs[i]
+            i += 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("queue index out of range")
+        position = self._start + index
+        while self._decided <= position:
+            self._decide()
+        return self._songs[position]
+
+    def unordered(self):
+        """The queued songs without deciding any more of the order"""
+        return itertools.islice(self._songs, self._start, None)
+
+    def snapshot(self):
+        """(songs, how many at the front are in decided order) - enough to
+        restore the queue, preview included"""
+        return self._songs[self._start:], self._decided - self._start
+
+    def append(self, song):
+        """Add to the current cycle, at a random place among the undecided"""
+        self._songs.insert(self._cycle_end, song)
+        self._cycle_end += 1
+
+    def requeue(self, song):
+        """Add to the next cycle"""
+        self._songs.append(song)
+
+    def appendleft(self, song):
+        self.insert(0, song)
+
+    def insert(self, index, song):
+        """Put `song` at play position `index`, deciding the order up to it"""
+        position = min(self._start + index, len(self._songs))
+        while self._decided < position and self._decide():
+            pass
+        self._songs.insert(position, song)
+        self._decided += 1
+        if position <= self._cycle_end:
+            self._cycle_end += 1
+
+    def extend(self, songs):
+        for song in songs:
+            self.append(song)
+
+    def extendleft(self, songs):
+        for song in songs:
+            self.appendleft(song)
+
+    def popleft(self):
+        if not len(self):
+            raise IndexError("pop from an empty queue")
+        if self._decided == self._start:
+            self._decide()
+        song = self._songs[self._start]
+        self._songs[self._start] = None
+        self._start += 1
+        self._last_url = song["url"]
+        if self._start == len(self._songs) or (
+            self._start >= self.COMPACT_MIN and self._start * 2 >= len(self._songs)
+        ):
+            del self._songs[:self._start]
+            self._decided -= self._start
+            self._cycle_end -= self._start
+            self._start = 0
+        return song
+
+    def remove(self, song):
+        """Remove `song` by identity; True if it was queued"""
+        for i in range(self._start, len(self._songs)):
+            if self._songs[i] is song:
+                del self._songs[i]
+                if i < self._decided:
+                    self._decided -= 1
+                if i < self._cycle_end:
+                    self._cycle_end -= 1
+                return True
+        return False
+
+    def clear(self):
+        self._songs.clear()
+        self._start = self._decided = self._cycle_end = 0
+
+    def reshuffle(self):
+        """Forget the order decided so far, merging in the next cycle"""
+        self._decided = self._start
+        self._cycle_end = len(self._songs)
+
+
+class SessionHistory:
+    """Songs played this voice session, oldest first, for /history and
+    /previous: the HISTORY_TAIL most recent in memory, older ones spilled to
+    a ring file of fixed-size slots at `path` (see HISTORY_SPILL_DIR) that
+    wraps at HISTORY_LIMIT. Appending and popping the latest are O(1), a
+    /history page costs one slot read per song, and memory stays constant
+    however long the session gets. Spilled songs come back as new dicts, so
+    identity checks only hold within the tail.
+
+    Supports len(), truthiness, [-1] and iteration over the in-memory tail
+    (`recent()`)."""
+
+    SLOT = struct.Struct("<H")  # length of the JSON record that follows
+    SLOT_BYTES = 512
+
+    def __init__(self, path=None):
+        self.path = path  # set by get_queue(); None keeps everything in memory
+        if HISTORY_SPILL_DIR and HISTORY_LIMIT != 0:
+            self.tail = deque(maxlen=HISTORY_TAIL if HISTORY_LIMIT is None else min(HISTORY_LIMIT, HISTORY_TAIL))
+            self.capacity = None if HISTORY_LIMIT is None else HISTORY_LIMIT - self.tail.maxlen
+        else:
+            self.tail = deque(maxlen=HISTORY_LIMIT)
+            self.capacity = 0
+        self.top = 0  # sequence number of the next slot to write
+        self.spilled = 0  # songs on disk, in slots [top - spilled, top)
+
+    def __len__(self):
+        return len(self.tail) + self.spilled
+
+    def __getitem__(self, index):
+        return self.tail[index]
+
+    def recent(self):
+        return iter(self.tail)
+
+    def append(self, song):
+        if len(self.tail) == self.tail.maxlen and self.path and self.capacity != 0:
+            self._spill(self.tail[0])
+        self.tail.append(song)
+
+    def take_previous(self, exclude=None):
+        """Remove and return the most recent song that isn't `exclude`
+        (compared by identity), or None"""
+        for i in range(len(self.tail) - 1, -1, -1):
+            if self.tail[i] is not exclude:
+                song = self.tail[i]
+                del self.tail[i]
+                return song
+        if self.spilled:
+            song = self._read(self.top - 1)
+            self.top -= 1
+            self.spilled -= 1
+            return song
+        return None
+
+    def page(self, start, count):
+        """Up to `count` songs, most recent first, skipping the `start` most
+        recent"""
+        songs = list(itertools.islice(reversed(self.tail), start, start + count))
+        first = max(0, start - len(self.tail))
+        for i in range(first, min(self.spilled, first + count - len(songs))):
+            songs.append(self._read(self.top - 1 - i))
+        return songs
+
+    def clear(self):
+        self.tail.clear()
+        # Even with top back at 0 (take_previous() popped every spilled
+        # song) the file is still there
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+        self.top = self.spilled = 0
+
+    def _offset(self, sequence):
+        slot = sequence if self.capacity is None else sequence % self.capacity
+        return slot * self.SLOT_BYTES
+
+    def _spill(self, song):
+        record = song_to_dict(song)
+        data = json.dumps(record).encode()
+        limit = self.SLOT_BYTES - self.SLOT.size
+        while len(data) > limit and (record["title"] or record["uploader"]):
+            # Only an absurdly long title or uploader gets here (halve the
+            # longer one); the URL has to survive
+            field = max(("title", "uploader"), key=lambda name: len(record[name] or ""))
+            record[field] = record[field][: len(record[field]) // 2]
+            data = json.dumps(record).encode()
+        if len(data) > limit:
+            logging.warning(f"Dropping history entry {record['url']}: too long for a spill slot")
+            return
+        try:
+            if self.top == 0:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "r+b" if self.top else "wb") as f:
+                f.seek(self._offset(self.top))
+                f.write(self.SLOT.pack(len(data)) + data)
+        except OSError as e:
+            logging.warning(f"Failed to spill history to {self.path}: {e}")
+            return
+        self.top += 1
+        if self.capacity is None or self.spilled < self.capacity:
+            self.spilled += 1
+
+    def _read(self, sequence):
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset(sequence))
+                (length,) = self.SLOT.unpack(f.read(self.SLOT.size))
+                return song_from_dict(json.loads(f.read(length)))
+        except (OSError, ValueError, struct.error) as e:
+            logging.warning(f"Failed to read spilled history from {self.path}: {e}")
+            return {"url": None, "title": "Unknown", "duration": 0, "uploader": "Unknown",
+                    "requester": RequesterRef(None)}
 
 
 class MusicQueue:
     def __init__(self):
-        self.queue = deque()
+        self.queue = FairQueue() if FAIR_QUEUE else deque()  # Upcoming songs
+        # in play order; a FairQueue in fair-queue mode (see set_fair), a
+        # ShuffledQueue in shuffle-play mode (see set_shuffled)
         self.current = None
         self.is_playing = False
         self.volume = 0.5  # Default volume (50%)
@@ -456,15 +1846,57 @@ class MusicQueue:
         # should not advance the queue itself
         self.notify_mode = "mute"  # "on", "mute", or "off" - auto-advance announcements
         self.loop_mode = DEFAULT_LOOP_MODE  # "off", "song", or "queue"
-        self.history = deque(maxlen=HISTORY_LIMIT)  # Songs played this voice
-        # session, oldest first; cleared when the bot leaves voice
+        self.history = SessionHistory()  # Songs played this voice session,
+        # oldest first; cleared when the bot leaves voice
         self.skip_requested = False  # Set by /skip, consumed once by
         # advance_queue so a skip advances even under loop_mode "song"
         self.auto_paused = False  # True while paused because the channel is
         # empty (AUTO_PAUSE), so a later rejoin knows to resume; left False
         # (and untouched) for a deliberate /pause
-        self.leave_task = None  # Pending AUTO_LEAVE_SECONDS disconnect timer,
-        # cancelled if someone rejoins first
+        self.leaving = False  # Set just before a deliberate disconnect (/leave,
+        # auto-leave) so it isn't taken for a dropped connection
+        self.parked = None  # (song, YTDLSource, text channel) kept open by a
+        # mid-song disconnect for reconnect_voice() to resume
+        self.reconnect_task = None  # Running reconnect_voice(), if any
+        self.reconnected_at = None  # time.monotonic() of the last reconnect
+        self.disconnect_forced = False  # Last voice disconnect came from
+        # Discord (a moderator, the channel going away), not from discord.py
+        self.resume = None  # (song, seconds) restored from POSITION_FILE: the
+        # song a restart interrupted and how far into it playback had got
+        self.autoplay = AUTOPLAY  # Carry on with related tracks when the queue runs out
+        self.autoplay_pool = deque(maxlen=AUTOPLAY_POOL_SIZE)  # Flat yt-dlp
+        # entries related to autoplay_seed, ready for when the queue runs out
+        self.autoplay_seed = None  # URL of the song the pool was fetched for
+        self.autoplay_task = None  # Pending refill_autoplay_pool(), if any
+        self.announcer = Announcer()  # Coalesces automatic announcements
+        self.last_used = time.monotonic()  # Last get_queue(), for idle eviction
+        # Running totals over self.queue, kept in step by every method that
+        # adds or removes songs - so go through those rather than mutating
+        # self.queue directly.
+        self.total_duration = 0  # Seconds of queued songs with a known length
+        self.unknown_durations = 0  # Queued songs without one (e.g. streams)
+        self.requester_totals = {}  # requester id -> [songs, seconds] queued
+
+    def _account(self, song, sign):
+        """Update the running totals for `song` entering (sign=1) or leaving
+        (sign=-1) the queue; returns the song"""
+        # song_requester_id() inlined: this runs for every song queued and
+        # popped, and getattr() with a default is a good part of its cost
+        requester = song["requester"]
+        requester_id = None if requester is None else requester.id
+        totals = self.requester_totals.get(requester_id)
+        if totals is None:
+            totals = self.requester_totals[requester_id] = [0, 0]
+        duration = song["duration"]
+        if duration:
+            self.total_duration += sign * duration
+            totals[1] += sign * duration
+        else:
+            self.unknown_durations += sign
+        totals[0] += sign
+        if not totals[0]:
+            del self.requester_totals[requester_id]
+        return song
 
     def add(self, song_data, position="end"):
         """Add a song to the queue
@@ -473,25 +1905,173 @@ class MusicQueue:
             song_data: Song information dictionary
             position: 'end' to add to end of queue, 'next' to add to beginning
         """
+        self._account(song_data, 1)
         if position == "next":
             self.queue.appendleft(song_data)
         else:
             self.queue.append(song_data)
 
+    def extend(self, entries, requester, position=None):
+        """Queue extracted entries in one pass, in order
+
+        Args:
+            entries: Entries from extract_playlist (flat yt-dlp entries)
+            requester: Member/User credited with every song
+            position: Index to insert the first song at; None for the end
+        """
+        if position is None or position >= len(self.queue):
+            self.queue.extend(
+                self._account(build_song_info(entry, requester), 1) for entry in entries
+            )
+            return
+        if not isinstance(self.queue, deque):
+            for offset, entry in enumerate(entries):
+                self.queue.insert(position + offset, self._account(build_song_info(entry, requester), 1))
+            return
+        # Bring the insertion point to the front, push the songs on there
+        # (extendleft reverses, so feed it reversed) and rotate back
+        self.queue.rotate(-position)
+        self.queue.extendleft(
+            self._account(build_song_info(entry, requester), 1) for entry in reversed(entries)
+        )
+        self.queue.rotate(position)
+
+    def replace(self, songs, pinned=0):
+        """Make `songs` the whole queue (e.g. restored from STATE_FILE). The
+        first `pinned` of them keep their place: ahead of the rotation in
+        fair-queue mode, as the already-decided order in shuffle-play."""
+        self.clear()
+        songs = (self._account(song, 1) for song in songs)
+        if self.shuffled:
+            self.queue = ShuffledQueue(songs, decided=pinned)
+            return
+        if self.fair and pinned:
+            self.queue.extendleft(reversed(list(itertools.islice(songs, pinned))))
+        self.queue.extend(songs)
+
+    def at_defaults(self):
+        """True if every setting save_state() persists is at its default"""
+        return (
+            self.loop_mode == DEFAULT_LOOP_MODE
+            and self.notify_mode == "mute"
+            and self.volume == 0.5
+            and self.fair == FAIR_QUEUE
+            and not self.shuffled
+            and self.autoplay == AUTOPLAY
+        )
+
+    @property
+    def fair(self):
+        return isinstance(self.queue, FairQueue)
+
+    @property
+    def shuffled(self):
+        return isinstance(self.queue, ShuffledQueue)
+
+    def set_fair(self, enabled):
+        """Switch fair-queue mode on or off, keeping the songs. Turning it
+        on sorts everything into requester turns (ending shuffle-play);
+        turning it off freezes the current interleaved order."""
+        if enabled != self.fair:
+            self.queue = FairQueue(self.queue) if enabled else deque(self.queue)
+
+    def set_shuffled(self, enabled):
+        """Switch shuffle-play on or off, keeping the songs. Turning it on
+        ends fair-queue mode; turning it off keeps the order shuffle-play
+        would have played."""
+        if enabled != self.shuffled:
+            self.queue = ShuffledQueue(self.queue) if enabled else deque(self.queue)
+
+    def requeue(self, song):
+        """Queue `song` again after it played, for loop_mode "queue" - in
+        shuffle-play it waits for the next cycle"""
+        self._account(song, 1)
+        if self.shuffled:
+            self.queue.requeue(song)
+        else:
+            self.queue.append(song)
+
+    def songs(self):
+        """The queued songs in no particular order - unlike iterating
+        self.queue, this doesn't fix any more of a shuffle-play order"""
+        return self.queue.unordered() if self.shuffled else iter(self.queue)
+
+    def snapshot(self):
+        """(songs in play order, how many at the front must keep their
+        place) - what save_state() persists and replace() takes back"""
+        if self.shuffled:
+            return self.queue.snapshot()
+        return list(self.queue), len(self.queue.pinned) if self.fair else 0
+
     def get_next(self):
         if self.queue:
-            return self.queue.popleft()
+            return self._account(self.queue.popleft(), -1)
         return None
 
+    def remove_song(self, song):
+        """Remove `song` by identity (equal dicts may be queued twice);
+        True if it was still queued"""
+        if not isinstance(self.queue, deque):
+            if self.queue.remove(song):
+                self._account(song, -1)
+                return True
+            return False
+        for i, queued in enumerate(self.queue):
+            if queued is song:
+                del self.queue[i]
+                self._account(song, -1)
+                return True
+        return False
+
+    def update_song(self, song, **fields):
+        """Change fields (e.g. a refreshed duration) of a queued song"""
+        self._account(song, -1)
+        song.update(fields)
+        self._account(song, 1)
+
+    def move(self, from_index, to_index):
+        """Move the song at from_index to to_index (0-based); returns it.
+        In fair-queue mode it may land later than to_index - see
+        FairQueue.insert."""
+        if not isinstance(self.queue, deque):
+            song = self.queue[from_index]
+            self.queue.remove(song)
+            self.queue.insert(to_index, song)
+            return song
+        queue_list = list(self.queue)
+        song = queue_list.pop(from_index)
+        queue_list.insert(to_index, song)
+        self.queue = deque(queue_list)
+        return song
+
+    def pop_at(self, index):
+        """Remove and return the song at index (0-based)"""
+        if not isinstance(self.queue, deque):
+            song = self.queue[index]
+            self.queue.remove(song)
+            return self._account(song, -1)
+        queue_list = list(self.queue)
+        song = queue_list.pop(index)
+        self.queue = deque(queue_list)
+        return self._account(song, -1)
+
     def clear(self):
         self.queue.clear()
+        self.total_duration = 0
+        self.unknown_durations = 0
+        self.requester_totals.clear()
 
     def get_queue_list(self):
         return list(self.queue)
 
     def shuffle(self):
         """Shuffle the queue"""
-        import random
+        if self.fair:
+            self.queue.shuffle()
+            return
+        if self.shuffled:
+            self.queue.reshuffle()
+            return
         queue_list = list(self.queue)
         random.shuffle(queue_list)
         self.queue = deque(queue_list)
@@ -516,78 +2096,713 @@ class MusicQueue:
         """Get current consecutive error count"""
         return self.consecutive_errors
 
+    def take_resume_position(self, song):
+        """Start offset for `song`: where a restart interrupted it, if it's
+        that song, else 0. Consumed either way - only the first play after
+        a restart resumes."""
+        resume, self.resume = self.resume, None
+        if resume and resume[0] is song:
+            return resume[1]
+        return 0
+
+    def current_remaining(self, elapsed):
+        """Seconds left of the current song, `elapsed` seconds in (None if
+        nothing is playing or its length is unknown)"""
+        if not self.current or not self.current["duration"]:
+            return None
+        return max(0, self.current["duration"] - (elapsed or 0))
+
+    def etas(self, elapsed):
+        """(seconds, exact) until each queued song starts, in play order,
+        given the current song is `elapsed` seconds in: one running sum,
+        taken only as far as it's iterated. `exact` is False once songs of
+        unknown length come first, making it a lower bound. Yields nothing
+        under loop_mode "song", where the queue doesn't move on its own."""
+        if self.loop_mode == "song" and self.current:
+            return
+        remaining = self.current_remaining(elapsed)
+        exact = remaining is not None or not self.current
+        seconds = remaining or 0
+        for song in self.queue:
+            yield seconds, exact
+            if song["duration"]:
+                seconds += song["duration"]
+            else:
+                exact = False
+
+    def time_until_end(self, elapsed):
+        """(seconds, exact) until everything queued has played, from the
+        running totals - see etas(). None under loop_mode "song"."""
+        if self.loop_mode == "song" and self.current:
+            return None
+        remaining = self.current_remaining(elapsed)
+        exact = remaining is not None or not self.current
+        return (remaining or 0) + self.total_duration, exact and not self.unknown_durations
+
 
 # Dictionary to store music queues for each guild
 music_queues = {}
+# Guild queues built and evicted (see evict_idle_queues) since startup
+queue_counters = {"created": 0, "evicted": 0}
 
 
 def get_queue(guild_id):
-    if guild_id not in music_queues:
-        music_queues[guild_id] = MusicQueue()
-    return music_queues[guild_id]
+    queue = music_queues.get(guild_id)
+    if queue is None:
+        queue = music_queues[guild_id] = MusicQueue()
+        if HISTORY_SPILL_DIR:
+            queue.history.path = os.path.join(HISTORY_SPILL_DIR, f"{guild_id}.history")
+        queue_counters["created"] += 1
+    queue.last_used = time.monotonic()
+    arm_queue_sweep()
+    return queue
+
+
+def arm_queue_sweep():
+    """Make sure evict_idle_queues() runs. Called on every get_queue(), as
+    any use may leave a queue evictable later; the sweep itself stops
+    re-arming once no queue in memory could be evicted."""
+    if QUEUE_EVICT_SECONDS <= 0 or timers.pending("evict_idle_queues"):
+        return
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return  # not started yet; setup_hook arms it
+    timers.schedule("evict_idle_queues", QUEUE_SWEEP_SECONDS, evict_idle_queues)
 
 
-def save_state():
-    """Snapshot each guild's queue (current song first, if one is actually
-    playing) plus loop_mode/notify_mode/volume to STATE_FILE. Guilds sitting
-    at all-default values are skipped so the file only tracks what's worth
-    restoring. Written via a temp file + rename so a crash mid-write can't
-    leave a corrupt file behind."""
-    guilds = {}
+def queue_is_evictable(guild_id, queue, idle_since):
+    """True if dropping the guild's MusicQueue loses nothing: nothing queued
+    or playing, settings at their defaults, not in voice, no timers or
+    background work pending, and untouched since `idle_since`"""
+    if queue.last_used > idle_since or queue.queue or queue.current or queue.resume:
+        return False
+    if not queue.at_defaults() or queue.announcer.pending or queue.announcer.live:
+        return False
+    if queue.autoplay_task and not queue.autoplay_task.done():
+        return False
+    if timers.pending(("auto_leave", guild_id)) or timers.pending(("live_card", guild_id)):
+        return False
+    guild = bot.get_guild(guild_id)
+    return not (guild and guild.voice_client)
+
+
+def evict_idle_queues():
+    """Timer callback: drop the MusicQueues (and voice-send stats) of guilds
+    idle for QUEUE_EVICT_SECONDS, then re-arm while any queue left could
+    still become evictable, so an idle bot's TimerWheel can stop. get_queue()
+    builds a fresh one on the next command, which is exactly what such a
+    guild would have restored from STATE_FILE too (save_state() skips
+    all-default guilds)."""
+    idle_since = time.monotonic() - QUEUE_EVICT_SECONDS
+    idle = [g for g, q in music_queues.items() if queue_is_evictable(g, q, idle_since)]
+    for guild_id in idle:
+        del music_queues[guild_id]
+        voice_send_stats.pop(guild_id, None)
+    if idle:
+        queue_counters["evicted"] += len(idle)
+        logging.info(f"Evicted {len(idle)} idle guild queue(s); {len(music_queues)} still in memory")
+    if any(queue_is_evictable(g, q, math.inf) for g, q in music_queues.items()):
+        timers.schedule("evict_idle_queues", QUEUE_SWEEP_SECONDS, evict_idle_queues)
+
+
+# STATE_FORMAT "binary" layout: a STATE_HEADER (magic, schema version),
+# then records of (kind, payload length, payload), read one at a time so a
+# load never holds more than one guild's queue in undecoded form:
+#   b"S" strings appended to the string table: a u32 count, that many u32
+#        lengths (in code points), then all the strings as one UTF-8 run
+#        (lone surrogates, which titles do turn up with, passed through),
+#        so a load decodes it in one go and slices it up. Everything else
+#        refers to strings by their table index, so a URL, title or
+#        uploader is stored once however many queues hold it. Index 0 is
+#        None, which is never written out (version 1 had no None, and one
+#        u32 length + UTF-8 per string).
+#   b"G" a guild: STATE_GUILD, then one STATE_SONG per queued song
+#   b"H" the media host buffer statistics, as JSON (small and free-form)
+# Readers skip record kinds they don't know; anything else incompatible
+# bumps STATE_VERSION.
+STATE_MAGIC = b"JKBX"
+STATE_VERSION = 2
+STATE_HEADER = struct.Struct("<4sH")
+STATE_RECORD = struct.Struct("<cI")
+# id, loop mode, notify mode, volume, flags (STATE_FLAGS), pinned, songs
+STATE_GUILD = struct.Struct("<QIIdBII")
+# url, title, duration (NaN if unknown), uploader, requester id
+STATE_SONG = struct.Struct("<IIdIQ")
+STATE_FLAGS = {"fair_queue": 1, "shuffle": 2, "autoplay": 4}
+STATE_NO_REQUESTER = 2**64 - 1
+
+
+def saved_guilds():
+    """(guild_id, queue, songs, pinned) for every guild worth persisting:
+    current song first if one is actually playing, then the queue. Guilds
+    sitting at all-default values are skipped."""
     for guild_id, queue in music_queues.items():
-        songs = list(queue.queue)
+        songs, pinned = queue.snapshot()
         if queue.current and queue.is_playing:
             songs = [queue.current] + songs
-        is_default = (
-            not songs
-            and queue.loop_mode == DEFAULT_LOOP_MODE
-            and queue.notify_mode == "mute"
-            and queue.volume == 0.5
-        )
-        if is_default:
+            pinned += 1  # so it's still first after a restart
+        if not songs and queue.at_defaults():
             continue
-        guilds[str(guild_id)] = {
+        # Songs at the front that keep their place (see MusicQueue.snapshot)
+        yield guild_id, queue, songs, pinned if queue.fair or queue.shuffled else 0
+
+
+def write_json_state(f, media_hosts):
+    guilds = {
+        str(guild_id): {
             "loop_mode": queue.loop_mode,
             "notify_mode": queue.notify_mode,
             "volume": queue.volume,
+            "fair_queue": queue.fair,
+            "shuffle": queue.shuffled,
+            "autoplay": queue.autoplay,
+            "pinned": pinned,
             "queue": [song_to_dict(s) for s in songs],
         }
+        for guild_id, queue, songs, pinned in saved_guilds()
+    }
+    f.write(json.dumps({"guilds": guilds, "media_hosts": media_hosts}).encode())
+
+
+def write_binary_state(f, media_hosts):
+    table = {None: 0}  # e.g. a flat playlist entry's "title": None
+    new = []
+    guilds = []
+
+    def ref(text):
+        index = table.get(text)
+        if index is None:
+            index = table[text] = len(table)
+            new.append(text)
+        return index
+
+    def record(kind, payload):
+        f.write(STATE_RECORD.pack(kind, len(payload)))
+        f.write(payload)
+
+    f.write(STATE_HEADER.pack(STATE_MAGIC, STATE_VERSION))
+    for guild_id, queue, songs, pinned in saved_guilds():
+        flags = (
+            queue.fair * STATE_FLAGS["fair_queue"]
+            | queue.shuffled * STATE_FLAGS["shuffle"]
+            | queue.autoplay * STATE_FLAGS["autoplay"]
+        )
+        body = [STATE_GUILD.pack(
+            guild_id, ref(queue.loop_mode), ref(queue.notify_mode), queue.volume, flags, pinned, len(songs)
+        )]
+        for song in songs:
+            requester_id = song_requester_id(song)
+            body.append(STATE_SONG.pack(
+                ref(song["url"]),
+                ref(song["title"]),
+                math.nan if song["duration"] is None else song["duration"],
+                ref(song["uploader"]),
+                STATE_NO_REQUESTER if requester_id is None else requester_id,
+            ))
+        guilds.append(b"".join(body))
+    # One string table up front rather than one per guild: a load then
+    # decodes every string in a single pass
+    text = "".join(new).encode(errors="surrogatepass")
+    record(b"S", struct.pack(f"<I{len(new)}I", len(new), *map(len, new)) + text)
+    for body in guilds:
+        record(b"G", body)
+    record(b"H", json.dumps(media_hosts).encode())
+
+
+def save_state():
+    """Snapshot each guild's queue (current song first, if one is actually
+    playing) plus loop_mode/notify_mode/volume and the fair-queue,
+    shuffle-play and autoplay modes to STATE_FILE, in STATE_FORMAT, along
+    with the per-media-host buffer statistics. Guilds sitting at all-default
+    values are skipped so the file only tracks what's worth restoring.
+    Written via a temp file + rename so a crash mid-write can't leave a
+    corrupt file behind."""
+    media_hosts = {host: p.to_dict() for host, p in list(media_host_profiles.items())}
 
     try:
         tmp_path = f"{STATE_FILE}.tmp"
-        with open(tmp_path, "w") as f:
-            json.dump({"guilds": guilds}, f)
+        with open(tmp_path, "wb") as f:
+            if STATE_FORMAT == "binary":
+                write_binary_state(f, media_hosts)
+            else:
+                write_json_state(f, media_hosts)
         os.replace(tmp_path, STATE_FILE)
-    except OSError as e:
+    except (OSError, struct.error) as e:
+        # struct.error: a value that doesn't fit its STATE_FORMAT "binary" field
         logging.warning(f"Failed to save state to {STATE_FILE}: {e}")
 
 
+def read_json_state(f):
+    """Yield ("guild", guild_id, settings, songs) and ("media_host", host,
+    saved) entries from a JSON state file"""
+    data = json.load(f)
+    for guild_id_str, saved in data.get("guilds", {}).items():
+        songs = (song_from_dict(s) for s in saved.get("queue", []))
+        yield "guild", guild_id_str, saved, songs
+    for host, saved in data.get("media_hosts", {}).items():
+        yield "media_host", host, saved
+
+
+def read_binary_state(f):
+    """Like read_json_state(), for STATE_FORMAT "binary", one record at a
+    time. Raises ValueError on a file from a newer schema version."""
+    magic, version = STATE_HEADER.unpack(f.read(STATE_HEADER.size))
+    if version > STATE_VERSION:
+        raise ValueError(f"state schema version {version} is newer than this bot's ({STATE_VERSION})")
+    table = [] if version == 1 else [None]
+    requesters = {}  # id -> RequesterRef, shared by all the id's songs
+    while header := f.read(STATE_RECORD.size):
+        kind, length = STATE_RECORD.unpack(header)
+        payload = f.read(length)
+        if len(payload) != length:
+            raise ValueError("truncated record")
+        if kind == b"S" and version == 1:
+            offset = 0
+            while offset < length:
+                (size,) = struct.unpack_from("<I", payload, offset)
+                table.append(payload[offset + 4:offset + 4 + size].decode())
+                offset += 4 + size
+        elif kind == b"S":
+            (count,) = struct.unpack_from("<I", payload)
+            offsets = list(itertools.accumulate(struct.unpack_from(f"<{count}I", payload, 4), initial=0))
+            text = payload[4 + 4 * count:].decode(errors="surrogatepass")
+            if len(text) != offsets[-1]:
+                raise ValueError("corrupt string table")
+            table.extend(map(text.__getitem__, map(slice, offsets, offsets[1:])))
+        elif kind == b"G":
+            guild_id, loop_mode, notify_mode, volume, flags, pinned, count = STATE_GUILD.unpack_from(payload)
+            settings = {"loop_mode": table[loop_mode], "notify_mode": table[notify_mode], "volume": volume, "pinned": pinned}
+            for name, bit in STATE_FLAGS.items():
+                settings[name] = bool(flags & bit)
+            songs = [
+                {
+                    "url": table[url],
+                    "title": table[title],
+                    # NaN != NaN: unknown length
+                    "duration": None if duration != duration else int(duration) if duration.is_integer() else duration,
+                    "uploader": table[uploader],
+                    "requester": requesters.get(requester_id) or requesters.setdefault(
+                        requester_id, RequesterRef(None if requester_id == STATE_NO_REQUESTER else requester_id)
+                    ),
+                }
+                for url, title, duration, uploader, requester_id in STATE_SONG.iter_unpack(
+                    memoryview(payload)[STATE_GUILD.size:STATE_GUILD.size + count * STATE_SONG.size]
+                )
+            ]
+            yield "guild", guild_id, settings, songs
+        elif kind == b"H":
+            for host, saved in json.loads(payload).items():
+                yield "media_host", host, saved
+
+
+def restore_guild(guild_id, saved, songs):
+    queue = get_queue(guild_id)
+    queue.loop_mode = saved.get("loop_mode", DEFAULT_LOOP_MODE)
+    queue.notify_mode = saved.get("notify_mode", "mute")
+    queue.volume = saved.get("volume", 0.5)
+    queue.set_fair(saved.get("fair_queue", FAIR_QUEUE))
+    queue.set_shuffled(saved.get("shuffle", False))
+    queue.autoplay = saved.get("autoplay", AUTOPLAY)
+    queue.replace(songs, pinned=saved.get("pinned", 0))
+
+
 def load_state():
-    """Restore queues/settings saved by save_state(). Missing or corrupt
-    state is not fatal - just start fresh, same as a first run."""
+    """Restore queues/settings saved by save_state(), in either format.
+    Missing or corrupt state is not fatal - just start fresh, same as a
+    first run (keeping whatever was read before the corruption)."""
     try:
-        with open(STATE_FILE) as f:
-            data = json.load(f)
+        f = open(STATE_FILE, "rb")
     except FileNotFoundError:
         return
-    except (OSError, json.JSONDecodeError) as e:
+    except OSError as e:
         logging.warning(f"Failed to load state from {STATE_FILE}: {e}")
         return
 
     restored = 0
-    for guild_id_str, saved in data.get("guilds", {}).items():
+    complete = True
+    with f:
+        binary = f.read(len(STATE_MAGIC)) == STATE_MAGIC
+        f.seek(0)
         try:
-            queue = get_queue(int(guild_id_str))
-            queue.loop_mode = saved.get("loop_mode", DEFAULT_LOOP_MODE)
-            queue.notify_mode = saved.get("notify_mode", "mute")
-            queue.volume = saved.get("volume", 0.5)
-            queue.queue = deque(song_from_dict(s) for s in saved.get("queue", []))
-            restored += 1
-        except Exception:
-            logging.warning(f"Skipping corrupt saved state for guild {guild_id_str}", exc_info=True)
+            for kind, key, saved, *songs in (read_binary_state if binary else read_json_state)(f):
+                try:
+                    if kind == "guild":
+                        restore_guild(int(key), saved, songs[0])
+                        restored += 1
+                    else:
+                        media_host_profiles[key] = MediaHostProfile.from_dict(saved)
+                except Exception:
+                    what = "saved state for guild" if kind == "guild" else "buffer statistics for media host"
+                    logging.warning(f"Skipping corrupt {what} {key}", exc_info=True)
+        except (OSError, ValueError, struct.error, UnicodeDecodeError, IndexError) as e:
+            # json.JSONDecodeError is a ValueError
+            logging.warning(f"Failed to load state from {STATE_FILE}: {e}")
+            complete = False
 
     if restored:
         logging.info(f"Restored persisted state for {restored} guild(s) from {STATE_FILE}")
+        load_positions()
+    if complete and binary != (STATE_FORMAT == "binary"):
+        logging.info(f"Converting {STATE_FILE} to STATE_FORMAT {STATE_FORMAT}")
+        save_state()
+
+
+def playback_position(guild_id):
+    """Seconds into the current song for a guild, or None if it isn't
+    playing one of ours"""
+    guild = bot.get_guild(guild_id)
+    source = guild.voice_client.source if guild and guild.voice_client else None
+    if isinstance(source, YTDLSource):
+        return source.position
+    queue = music_queues.get(guild_id)
+    if queue and queue.parked:  # reconnecting; keep checkpointing it
+        return queue.parked[1].position
+    return None
+
+
+def save_positions():
+    """Write each playing guild's current song URL and position to
+    POSITION_FILE. Kept apart from STATE_FILE so the frequent checkpoint
+    stays a tiny write; load_state() only applies a position when its URL
+    still matches the head of the restored queue."""
+    positions = {}
+    for guild_id, queue in list(music_queues.items()):
+        if not (queue.current and queue.is_playing):
+            continue
+        position = playback_position(guild_id)
+        if position:
+            positions[str(guild_id)] = {"url": queue.current["url"], "position": round(position, 2)}
+
+    try:
+        tmp_path = f"{POSITION_FILE}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(positions, f)
+        os.replace(tmp_path, POSITION_FILE)
+    except OSError as e:
+        logging.warning(f"Failed to save playback positions to {POSITION_FILE}: {e}")
+
+
+async def checkpoint_positions():
+    """Refresh POSITION_FILE every POSITION_SAVE_SECONDS while anything plays"""
+    had_positions = True  # write once at startup to drop a stale checkpoint
+    while True:
+        await asyncio.sleep(POSITION_SAVE_SECONDS)
+        playing = any(q.current and q.is_playing for q in music_queues.values())
+        if playing or had_positions:
+            save_positions()
+        had_positions = playing
+
+
+def load_positions():
+    """Arm each restored queue to resume its head song where a restart
+    interrupted it (see save_positions)"""
+    try:
+        with open(POSITION_FILE) as f:
+            positions = json.load(f)
+    except FileNotFoundError:
+        return
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"Failed to load playback positions from {POSITION_FILE}: {e}")
+        return
+
+    for guild_id_str, saved in positions.items():
+        try:
+            queue = music_queues.get(int(guild_id_str))
+            if queue and queue.queue and queue.queue[0]["url"] == saved["url"]:
+                queue.resume = (queue.queue[0], float(saved["position"]))
+        except Exception:
+            logging.warning(f"Skipping corrupt playback position for guild {guild_id_str}", exc_info=True)
+
+
+def probe_song(url):
+    """Check a song's page is still extractable, returning its metadata
+    without resolving formats (process=False). Raises DownloadError."""
+    return new_metadata_extractor().extract_info(url, download=False, process=False)
+
+
+def is_permanent_extraction_error(error):
+    """True for DownloadErrors yt-dlp flags as expected - removed, private or
+    region-blocked videos - as opposed to network trouble or rate limits
+    that may clear up by the time the song is reached."""
+    cause = getattr(error, "exc_info", None)
+    cause = cause[1] if cause else None
+    return isinstance(cause, yt_dlp.utils.ExtractorError) and cause.expected
+
+
+async def validate_restored_queues():
+    """Re-check every song restored by load_state() in batches of
+    VALIDATION_BATCH_SIZE, VALIDATION_CONCURRENCY at a time on the
+    background executor. Songs that are permanently unavailable are dropped
+    from their queue; ones saved without a title/duration get it filled in.
+    Songs that started playing or left the queue meanwhile are skipped, and
+    each distinct URL is probed only once across guilds."""
+    restored = [(guild_id, list(q.queue)) for guild_id, q in music_queues.items() if q.queue]
+    if not restored:
+        return
+
+    semaphore = asyncio.Semaphore(VALIDATION_CONCURRENCY)
+    probes = {}  # url -> Task, shared between duplicate entries
+
+    async def probe(url):
+        async with semaphore:
+            return await run_extraction(url, lambda: probe_song(url), background_executor)
+
+    checked = dropped = refreshed = 0
+    for guild_id, songs in restored:
+        queue = get_queue(guild_id)
+        for start in range(0, len(songs), VALIDATION_BATCH_SIZE):
+            present = {id(s) for s in queue.songs()}
+            batch = [s for s in songs[start:start + VALIDATION_BATCH_SIZE] if id(s) in present]
+            for song in batch:
+                if song["url"] not in probes:
+                    probes[song["url"]] = asyncio.ensure_future(probe(song["url"]))
+            results = await asyncio.gather(
+                *(probes[s["url"]] for s in batch), return_exceptions=True
+            )
+
+            dead = set()
+            present = {id(s) for s in queue.songs()}  # again, after awaiting
+            for song, result in zip(batch, results):
+                checked += 1
+                if isinstance(result, yt_dlp.utils.DownloadError):
+                    if is_permanent_extraction_error(result):
+                        dead.add(id(song))
+                        logging.info(f"Dropping unavailable restored song in guild {guild_id}: {song['url']} ({result})")
+                elif isinstance(result, Exception):
+                    logging.debug(f"Couldn't validate restored song {song['url']}: {result}")
+                elif song["title"] == "Unknown" or not song["duration"]:
+                    fields = {
+                        "title": result.get("title") or song["title"],
+                        "duration": result.get("duration") or song["duration"],
+                        "uploader": result.get("uploader") or song["uploader"],
+                    }
+                    if id(song) in present:
+                        queue.update_song(song, **fields)
+                    else:
+                        song.update(fields)  # already playing or gone
+                    refreshed += 1
+            for song in batch:
+                if id(song) in dead and queue.remove_song(song):
+                    dropped += 1
+            await asyncio.sleep(VALIDATION_BATCH_PAUSE_SECONDS)
+
+    if dropped or refreshed:
+        save_state()
+    logging.info(
+        f"Validated {checked} restored song(s): dropped {dropped} unavailable, "
+        f"refreshed metadata for {refreshed}"
+    )
+
+
+async def warm_stream_cache():
+    """Resolve the streams likeliest to be played first after a restart into
+    resolved_streams: each restored queue's next song, then the globally most
+    played tracks. Runs VALIDATION_CONCURRENCY at a time on the background
+    executor and never fills more than the cache holds."""
+    urls = {}  # dict as an ordered set: queue heads first
+    for queue in list(music_queues.values()):
+        if queue.queue:
+            urls[queue.queue[0]["url"]] = None
+    for url, *_ in play_stats.top_tracks(WARM_POPULAR_TRACKS):
+        urls[url] = None
+    urls = [url for url in urls if not url_recently_failed(url)][:STREAM_CACHE_LIMIT]
+    if not urls:
+        return
+
+    semaphore = asyncio.Semaphore(VALIDATION_CONCURRENCY)
+
+    async def warm(url):
+        async with semaphore:
+            try:
+                await resolve_stream(url, background_executor)
+                return True
+            except Exception as e:
+                logging.debug(f"Couldn't pre-resolve {url}: {e}")
+                return False
+
+    started = time.monotonic()
+    warmed = sum(await asyncio.gather(*(warm(url) for url in urls)))
+    logging.info(
+        f"Pre-resolved {warmed}/{len(urls)} stream URL(s) in {time.monotonic() - started:.1f}s"
+    )
+
+
+class PlayStats:
+    """Durable play log with running aggregates, in SQLite at STATS_FILE.
+
+    record() appends a row to `plays` and, in the same transaction, bumps
+    the per-track, per-guild-track, per-requester and per-guild aggregate
+    rows, so the top-N queries behind /stats and cache warming read a few
+    indexed rows instead of scanning the log. Tracks are keyed by
+    song_key() (the YouTube video id where there is one). Errors are
+    logged, never raised: stats must not get in the way of playback.
+
+    Writes happen on a thread of their own, with its own connection, so a
+    slow disk never stalls the event loop; queries use a second connection
+    on the loop (WAL lets them read alongside a write)."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS plays (
+            track TEXT NOT NULL, guild_id INTEGER NOT NULL, requester_id INTEGER,
+            played_at INTEGER NOT NULL, seconds REAL NOT NULL, skipped INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS tracks (
+            track TEXT PRIMARY KEY, url TEXT, title TEXT,
+            plays INTEGER NOT NULL, skips INTEGER NOT NULL, seconds REAL NOT NULL,
+            last_played INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS tracks_by_plays ON tracks (plays DESC);
+        CREATE TABLE IF NOT EXISTS guild_tracks (
+            guild_id INTEGER NOT NULL, track TEXT NOT NULL,
+            plays INTEGER NOT NULL, seconds REAL NOT NULL,
+            PRIMARY KEY (guild_id, track)
+        );
+        CREATE INDEX IF NOT EXISTS guild_tracks_by_plays ON guild_tracks (guild_id, plays DESC);
+        CREATE TABLE IF NOT EXISTS requesters (
+            guild_id INTEGER NOT NULL, requester_id INTEGER NOT NULL,
+            plays INTEGER NOT NULL, seconds REAL NOT NULL,
+            PRIMARY KEY (guild_id, requester_id)
+        );
+        CREATE TABLE IF NOT EXISTS guilds (
+            guild_id INTEGER PRIMARY KEY,
+            plays INTEGER NOT NULL, skips INTEGER NOT NULL, seconds REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = None  # for queries, on the event loop
+        self._writer_db = None  # only touched on the writer thread
+        self._writer = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="jukebox-stats"
+        )
+        self._lock = threading.Lock()  # so record() can't submit after close()
+        self._closed = False
+
+    def _open(self):
+        db = sqlite3.connect(self.path)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(self.SCHEMA)
+        return db
+
+    def _connect(self):
+        if self._db is None:
+            self._db = self._open()
+        return self._db
+
+    def record(self, guild_id, song, seconds, skipped):
+        """Queue a finished play for the writer thread; returns at once, from
+        any thread"""
+        if not self.path:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            self._writer.submit(
+                self._write,
+                guild_id,
+                song_key(song["url"]),
+                song["url"],
+                song["title"],
+                song_requester_id(song),
+                bool(song.get("autoplay")),
+                int(time.time()),
+                seconds,
+                int(bool(skipped)),
+            )
+
+    def _write(self, guild_id, track, url, title, requester_id, autoplay, now, seconds, skipped):
+        try:
+            if self._writer_db is None:
+                self._writer_db = self._open()
+            db = self._writer_db
+            with db:
+                db.execute(
+                    "INSERT INTO plays VALUES (?, ?, ?, ?, ?, ?)",
+                    (track, guild_id, requester_id, now, seconds, skipped),
+                )
+                db.execute(
+                    "INSERT INTO tracks VALUES (?, ?, ?, 1, ?, ?, ?) ON CONFLICT (track) DO UPDATE SET"
+                    " url = excluded.url, title = excluded.title, plays = plays + 1,"
+                    " skips = skips + excluded.skips, seconds = seconds + excluded.seconds,"
+                    " last_played = excluded.last_played",
+                    (track, url, title, skipped, seconds, now),
+                )
+                db.execute(
+                    "INSERT INTO guild_tracks VALUES (?, ?, 1, ?) ON CONFLICT (guild_id, track) DO UPDATE SET"
+                    " plays = plays + 1, seconds = seconds + excluded.seconds",
+                    (guild_id, track, seconds),
+                )
+                if requester_id is not None and not autoplay:  # nobody asked for those
+                    db.execute(
+                        "INSERT INTO requesters VALUES (?, ?, 1, ?) ON CONFLICT (guild_id, requester_id) DO UPDATE SET"
+                        " plays = plays + 1, seconds = seconds + excluded.seconds",
+                        (guild_id, requester_id, seconds),
+                    )
+                db.execute(
+                    "INSERT INTO guilds VALUES (?, 1, ?, ?) ON CONFLICT (guild_id) DO UPDATE SET"
+                    " plays = plays + 1, skips = skips + excluded.skips, seconds = seconds + excluded.seconds",
+                    (guild_id, skipped, seconds),
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Failed to record play in {self.path}: {e}")
+
+    def _query(self, sql, params=()):
+        if not self.path:
+            return []
+        try:
+            return self._connect().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logging.warning(f"Failed to read play stats from {self.path}: {e}")
+            return []
+
+    def top_tracks(self, limit=10, guild_id=None):
+        """[(url, title, plays, seconds)] most played first - across all
+        guilds, or in one"""
+        if guild_id is None:
+            return self._query(
+                "SELECT url, title, plays, seconds FROM tracks ORDER BY plays DESC LIMIT ?", (limit,)
+            )
+        return self._query(
+            "SELECT t.url, t.title, g.plays, g.seconds FROM guild_tracks g JOIN tracks t USING (track)"
+            " WHERE g.guild_id = ? ORDER BY g.plays DESC LIMIT ?",
+            (guild_id, limit),
+        )
+
+    def top_requesters(self, guild_id, limit=5):
+        """[(requester_id, plays, seconds)] in one guild, most plays first"""
+        return self._query(
+            "SELECT requester_id, plays, seconds FROM requesters WHERE guild_id = ?"
+            " ORDER BY plays DESC LIMIT ?",
+            (guild_id, limit),
+        )
+
+    def guild_totals(self, guild_id):
+        """(plays, skips, seconds) in one guild"""
+        rows = self._query("SELECT plays, skips, seconds FROM guilds WHERE guild_id = ?", (guild_id,))
+        return rows[0] if rows else (0, 0, 0)
+
+    def close(self):
+        """Finish the queued writes and close both connections"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._writer.submit(self._close_writer)
+        self._writer.shutdown(wait=True)
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _close_writer(self):
+        if self._writer_db is not None:
+            self._writer_db.close()
+            self._writer_db = None
+
+
+play_stats = PlayStats(STATS_FILE)
 
 
 async def ensure_guild(interaction: discord.Interaction) -> bool:
@@ -636,7 +2851,7 @@ async def ensure_voice(interaction: discord.Interaction) -> bool:
     if not interaction.guild.voice_client:
         channel = interaction.user.voice.channel
         try:
-            await channel.connect()
+            await channel.connect(cls=JukeboxVoiceClient)
             logging.info(f"Successfully connected to voice channel: {channel}")
             return True
         except Exception as e:
@@ -679,6 +2894,8 @@ async def extract_playlist(query):
 
     Returns:
         tuple: (playlist_entries, total_count, was_limited, is_single_video)
+        where playlist entries are yt-dlp's flat entries as-is - turning
+        them into queued songs is left to MusicQueue.extend()
     """
     loop = asyncio.get_running_loop()
 
@@ -724,19 +2941,7 @@ async def extract_playlist(query):
     if not entries:
         return [], 0, False, False
 
-    # Convert flat entries to standardized format
-    processed_entries = []
-    for entry in entries:
-        processed_entry = {
-            "title": entry.get("title", "Unknown"),
-            "duration": entry.get("duration", 0),
-            "uploader": entry.get("uploader", "Unknown"),
-            "id": entry.get("id"),
-            "url": entry.get("url"),
-        }
-        processed_entries.append(processed_entry)
-
-    return processed_entries, total_count, was_limited, False
+    return entries, total_count, was_limited, False
 
 
 def format_duration(duration):
@@ -747,13 +2952,48 @@ def format_duration(duration):
     return f"{duration // 60}:{duration % 60:02d}"
 
 
+def format_eta(eta):
+    """'in M:SS' for a MusicQueue.etas() / time_until_end() result, with a trailing +
+    when it's only a lower bound"""
+    seconds, exact = eta
+    return f"in {format_position(seconds)}{'' if exact else '+'}"
+
+
+def format_position(seconds):
+    """Format a playback position as M:SS (0:00 at the start, unlike
+    format_duration's 'Unknown')"""
+    seconds = int(seconds)
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+TIMESTAMP_PART_RE = re.compile(r"[0-9]+(?:\.[0-9]+)?")
+
+
+def parse_timestamp(text):
+    """Parse '83', '1:23' or '1:02:03' into seconds; None if malformed"""
+    parts = text.strip().split(":")
+    if not 1 <= len(parts) <= 3:
+        return None
+    # Plain digits only: float() alone would also take "inf", "nan", "1e400"
+    if not all(TIMESTAMP_PART_RE.fullmatch(p) for p in parts):
+        return None
+    values = [float(p) for p in parts]
+    if not all(math.isfinite(v) for v in values) or any(v >= 60 for v in values[1:]):
+        return None
+    seconds = 0.0
+    for value in values:
+        seconds = seconds * 60 + value
+    return seconds
+
+
 def build_song_info(entry, requester):
-    """Build the song dict stored in the queue from an extracted entry"""
+    """Build the song dict stored in the queue from an extracted entry
+    (flat playlist entries may lack any of the fields)"""
     return {
-        "url": entry["url"],
-        "title": entry["title"],
-        "duration": entry["duration"],
-        "uploader": entry["uploader"],
+        "url": entry.get("url"),
+        "title": entry.get("title", "Unknown"),
+        "duration": entry.get("duration", 0),
+        "uploader": entry.get("uploader", "Unknown"),
         "requester": requester,
     }
 
@@ -796,6 +3036,100 @@ def song_from_dict(d):
     }
 
 
+def video_id(url):
+    """The YouTube video id in a watch/youtu.be/shorts URL, else None"""
+    parts = urlsplit(url or "")
+    host = (parts.hostname or "").removeprefix("www.").removeprefix("m.").removeprefix("music.")
+    if host == "youtu.be":
+        return parts.path.strip("/") or None
+    if host == "youtube.com":
+        if parts.path == "/watch":
+            return parse_qs(parts.query).get("v", [None])[0]
+        if parts.path.startswith("/shorts/"):
+            return parts.path.split("/")[2] or None
+    return None
+
+
+def song_key(url):
+    """What makes two song URLs the same track, for de-duplication"""
+    return video_id(url) or url
+
+
+def autoplay_requester():
+    """Who autoplayed songs are credited to: the bot itself"""
+    return RequesterRef(bot.user.id if bot.user else 0)
+
+
+async def refill_autoplay_pool(queue, seed):
+    """Fetch candidates related to `seed` (its YouTube mix) into the
+    guild's autoplay pool, skipping anything played this session, queued
+    or already pooled, then warm the stream URL of the first one."""
+    queue.autoplay_seed = seed["url"]
+    seed_id = video_id(seed["url"])
+    if not seed_id:
+        return  # only YouTube has mixes to draw from
+    mix_url = f"https://www.youtube.com/watch?v={seed_id}&list=RD{seed_id}"
+    try:
+        data = await run_extraction(
+            mix_url,
+            lambda: new_metadata_extractor().extract_info(mix_url, download=False),
+            background_executor,
+        )
+    except (UpstreamUnavailable, yt_dlp.utils.DownloadError) as e:
+        logging.info(f"Couldn't fetch autoplay candidates for {seed['url']}: {e}")
+        return
+
+    seen = {song_key(s["url"]) for s in queue.history.recent()}
+    seen.update(song_key(s["url"]) for s in queue.songs())
+    seen.update(song_key(e.get("url")) for e in queue.autoplay_pool)
+    seen.add(seed_id)
+    for entry in data.get("entries") or []:
+        if len(queue.autoplay_pool) >= AUTOPLAY_POOL_SIZE:
+            break
+        key = song_key(entry.get("url"))
+        if entry.get("url") and key not in seen:
+            seen.add(key)
+            queue.autoplay_pool.append(entry)
+
+    if queue.autoplay_pool:
+        try:
+            await resolve_stream(queue.autoplay_pool[0]["url"], background_executor)
+        except Exception as e:
+            logging.debug(f"Couldn't pre-resolve autoplay candidate: {e}")
+
+
+def prefetch_autoplay(queue):
+    """Start refilling the autoplay pool in the background if autoplay is
+    about to be needed: it's on, nothing loops, the queue is nearly out and
+    the pool is low (or was fetched for an older song)"""
+    if not (queue.autoplay and queue.loop_mode == "off" and queue.current):
+        return
+    if len(queue.queue) > AUTOPLAY_PREFETCH_AT:
+        return
+    if queue.autoplay_task and not queue.autoplay_task.done():
+        return
+    if queue.autoplay_seed == queue.current["url"] and len(queue.autoplay_pool) > AUTOPLAY_POOL_SIZE // 2:
+        return
+    queue.autoplay_task = asyncio.create_task(refill_autoplay_pool(queue, queue.current))
+
+
+def queue_autoplay_candidate(queue):
+    """The queue ran out: add the next usable autoplay candidate to it.
+    False if autoplay is off or doesn't apply, or the pool is empty."""
+    if not (queue.autoplay and queue.loop_mode == "off"):
+        return False
+    played = {song_key(s["url"]) for s in queue.history.recent()}
+    while queue.autoplay_pool:
+        entry = queue.autoplay_pool.popleft()
+        if song_key(entry["url"]) in played or url_recently_failed(entry["url"]):
+            continue
+        song = build_song_info(entry, autoplay_requester())
+        song["autoplay"] = True
+        queue.add(song)
+        return True
+    return False
+
+
 def loop_suffix(queue):
     """Loop-mode emoji for card labels, with a leading space ('' when off)"""
     return {"song": " 🔂", "queue": " 🔁"}.get(queue.loop_mode, "")
@@ -812,17 +3146,41 @@ LOOP_MODE_LABELS = {
 NOTIFY_MODE_LABELS = {"on": "On", "mute": "Muted", "off": "Off"}
 
 
-def build_now_playing_embed(song_info, *, label="🎵 Now Playing", color=0x00FF00, footer=None, up_next=None):
-    """Compact now-playing card: small label on top, the song title as a
-    clickable link to the source, one detail line, and an optional footer
-    ('Up next' has to live there as plain text - footers can't hold links)."""
-    embed = discord.Embed(title=song_info["title"], url=song_info.get("url"), color=color)
-    embed.set_author(name=label)
+def progress_bar(position, duration, width=14):
+    """'▬▬▬🔘▬▬▬▬' with the knob `position` of the way through `duration`"""
+    knob = min(width - 1, int(position / duration * width)) if duration else 0
+    return "▬" * knob + "🔘" + "▬" * (width - 1 - knob)
+
+
+def now_playing_description(song_info, position=None):
+    """The detail line of a now-playing card; with `position` (seconds
+    in), a progress bar and elapsed/total time instead of just the length"""
     details = []
-    if song_info["duration"]:
+    if position is not None:
+        elapsed = format_position(position)
+        if song_info["duration"]:
+            details.append(
+                f"`{progress_bar(position, song_info['duration'])}` "
+                f"{elapsed} / {format_duration(song_info['duration'])}"
+            )
+        else:
+            details.append(f"{elapsed} elapsed")
+    elif song_info["duration"]:
         details.append(format_duration(song_info["duration"]))
     details.append(f"requested by {song_info['requester'].mention}")
-    embed.description = " · ".join(details)
+    return " · ".join(details)
+
+
+def build_now_playing_embed(
+    song_info, *, label="🎵 Now Playing", color=0x00FF00, footer=None, up_next=None, position=None
+):
+    """Compact now-playing card: small label on top, the song title as a
+    clickable link to the source, one detail line (with a progress bar when
+    `position` is given), and an optional footer ('Up next' has to live
+    there as plain text - footers can't hold links)."""
+    embed = discord.Embed(title=song_info["title"], url=song_info.get("url"), color=color)
+    embed.set_author(name=label)
+    embed.description = now_playing_description(song_info, position)
     footer_parts = [footer, f"Up next: {up_next}" if up_next else None]
     footer_text = " · ".join(p for p in footer_parts if p)
     if footer_text:
@@ -830,22 +3188,43 @@ def build_now_playing_embed(song_info, *, label="🎵 Now Playing", color=0x00FF
     return embed
 
 
-async def play_song(guild_id, channel, song_info):
-    """Start playing song_info right now, superseding any current playback.
+async def play_song(guild_id, channel, song_info, start_seconds=0, raise_unavailable=False):
+    """Start playing song_info right now (from `start_seconds` in),
+    superseding any current playback.
 
     Returns True if playback started, False if the audio couldn't be extracted
-    or the bot isn't connected to voice anymore.
+    or the bot isn't connected to voice anymore. With `raise_unavailable`,
+    an open circuit breaker raises UpstreamUnavailable instead, so the
+    caller can retry later rather than treat the song as broken.
     """
-    queue = get_queue(guild_id)
     guild = bot.get_guild(guild_id)
     if not guild or not guild.voice_client:
         return False
 
     try:
-        player = await YTDLSource.from_url(song_info["url"], guild_id)
+        player = await YTDLSource.from_url(song_info["url"], guild_id, start_seconds)
+    except UpstreamUnavailable as e:
+        if raise_unavailable:
+            raise
+        logging.warning(f"Not playing {song_info['url']}: {e}")
+        return False
     except Exception as e:
         logging.error(f"Error extracting audio for playback: {e}", exc_info=True)
         return False
+    return start_playback(guild_id, channel, song_info, player)
+
+
+def start_playback(guild_id, channel, song_info, player):
+    """Play an already opened YTDLSource on the guild's voice client,
+    superseding any current playback. Returns False if the bot isn't
+    connected to voice anymore."""
+    queue = get_queue(guild_id)
+    guild = bot.get_guild(guild_id)
+    player.parked = False
+    if not guild or not guild.voice_client:
+        player.cleanup()
+        return False
+    start_seconds = player.start_seconds
 
     # Bump the generation before touching the voice client so a stale
     # after_playing callback from whatever was playing before (fired by the
@@ -861,10 +3240,22 @@ async def play_song(guild_id, channel, song_info):
             logging.error(f"Player error: {error}")
         if generation != queue.generation:
             return  # a newer playback has already superseded this one
+        if not error and not voice_client.is_connected() and VOICE_RECONNECT_SECONDS > 0:
+            # Dropped out of voice mid-song (a deliberate leave stale-ifies
+            # this callback first): keep the stream open for reconnect_voice()
+            # instead of advancing
+            player.parked = True
+            bot.loop.call_soon_threadsafe(
+                park_source, guild_id, generation, song_info, player, channel, voice_client.channel
+            )
+            return
         if error:
             queue.increment_error_count()
         else:
             queue.reset_error_count()
+            listened = max(0.0, player.position - start_seconds)
+            skipped = queue.skip_requested
+            play_stats.record(guild_id, song_info, round(listened, 1), skipped)
         asyncio.run_coroutine_threadsafe(
             advance_queue(guild_id, channel, finished=song_info, errored=bool(error)),
             bot.loop,
@@ -877,40 +3268,335 @@ async def play_song(guild_id, channel, song_info):
     return True
 
 
-async def send_notification(channel, queue, *, embed, view=None, force=False):
+class TimerWheel:
+    """Per-guild deadlines (auto-leave, live card refreshes, ...) for every
+    guild, driven by one asyncio task instead of one sleeping task each.
+
+    A hierarchical timing wheel: LEVELS rings of 64 slots, the first `tick`
+    seconds per slot, each next one 64 times coarser (about a minute, then
+    an hour, per slot at the default one-second tick). A timer is filed in
+    the finest ring its deadline fits in; when the finer ring has gone
+    round once, the coarser slot coming due is emptied into it. Scheduling
+    and cancelling are O(1) whatever the number of timers, and the task
+    wakes once per tick only while timers are pending. Deadlines are
+    rounded to whole ticks, so timers fire to within a tick; ones past the
+    coarsest ring's span are filed at its far end and re-filed when that
+    slot comes due."""
+
+    SLOT_BITS = 6
+    SLOTS = 1 << SLOT_BITS
+    LEVELS = 3
+
+    def __init__(self, tick=1.0):
+        self.tick = tick
+        self.ticks = 0  # ticks elapsed while running
+        self.wheels = [[{} for _ in range(self.SLOTS)] for _ in range(self.LEVELS)]
+        self.timers = {}  # key -> the slot dict it's filed in
+        self.task = None
+
+    def schedule(self, key, delay, callback):
+        """Call `callback()` in `delay` seconds, replacing any timer already
+        under `key`. A coroutine it returns is run as a task."""
+        self.cancel(key)
+        self._file(key, (self.ticks + max(1, -int(-delay // self.tick)), callback))
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(asyncio.get_running_loop().time()))
+
+    def cancel(self, key):
+        slot = self.timers.pop(key, None)
+        if slot is not None:
+            del slot[key]
+
+    def pending(self, key):
+        return key in self.timers
+
+    def _file(self, key, timer):
+        due = min(timer[0], self.ticks + (1 << self.SLOT_BITS * self.LEVELS) - 1)
+        level = 0
+        while level < self.LEVELS - 1 and due - self.ticks >= 1 << self.SLOT_BITS * (level + 1):
+            level += 1
+        slot = self.wheels[level][(due >> self.SLOT_BITS * level) & (self.SLOTS - 1)]
+        slot[key] = timer
+        self.timers[key] = slot
+
+    def _advance(self):
+        """One tick: cascade the coarser slots coming due, then return the
+        callbacks of the timers that expired"""
+        self.ticks += 1
+        for level in range(self.LEVELS - 1, 0, -1):
+            shift = self.SLOT_BITS * level
+            if self.ticks & ((1 << shift) - 1) == 0:
+                index = (self.ticks >> shift) & (self.SLOTS - 1)
+                slot, self.wheels[level][index] = self.wheels[level][index], {}
+                for key, timer in slot.items():
+                    self._file(key, timer)
+        index = self.ticks & (self.SLOTS - 1)
+        slot, self.wheels[0][index] = self.wheels[0][index], {}
+        for key in slot:
+            del self.timers[key]
+        return [callback for _, callback in slot.values()]
+
+    async def _run(self, started):
+        loop = asyncio.get_running_loop()
+        next_tick = started  # ticks count from the first schedule() call
+        while self.timers:
+            next_tick += self.tick
+            await asyncio.sleep(next_tick - loop.time())
+            for callback in self._advance():
+                self._fire(callback)
+
+    @staticmethod
+    def _fire(callback):
+        try:
+            result = callback()
+            if asyncio.iscoroutine(result):
+                asyncio.create_task(result).add_done_callback(TimerWheel._log_failure)
+        except Exception:
+            logging.error("Timer callback failed", exc_info=True)
+
+    @staticmethod
+    def _log_failure(task):
+        if not task.cancelled() and task.exception():
+            logging.error("Timer callback failed", exc_info=task.exception())
+
+
+# Shared by every guild's periodic and one-shot timers
+timers = TimerWheel()
+
+
+# Automatic announcements closer together than this (a /skip storm, a run
+# of errors) collapse into one card: the first goes out at once, and the
+# latest of those that follow replaces it when the window closes.
+ANNOUNCE_COALESCE_SECONDS = 3
+
+
+class Announcer:
+    """A guild's automatic announcements (see send_notification).
+
+    Keeps the last card sent to each channel so a new announcement can edit
+    it in place - one REST call and no new message - as long as nothing else
+    has been posted below it. Counters only ever grow for the lifetime of
+    the process and are shown by /audiostats."""
+
+    def __init__(self):
+        self.cards = {}  # channel id -> last discord.Message we announced in it
+        self.window_ends = 0.0  # time.monotonic() the coalescing window closes
+        self.pending = None  # (channel, embed, view, silent, song) waiting for it
+        self.live = None  # (message, embed, song) of the now-playing card kept live
+        self.flush_task = None
+        self.sent = 0
+        self.edited = 0  # announcements that edited the previous card
+        self.coalesced = 0  # announcements superseded before going out
+
+    async def announce(self, channel, embed, view, silent, song=None):
+        now = time.monotonic()
+        if now < self.window_ends:
+            if self.pending:
+                self.coalesced += 1
+            self.pending = (channel, embed, view, silent, song)
+            if not self.flush_task or self.flush_task.done():
+                self.flush_task = asyncio.create_task(self._flush(self.window_ends - now))
+            return
+        self.window_ends = now + ANNOUNCE_COALESCE_SECONDS
+        # In "on" mode a fresh card is what pings people; an edit wouldn't
+        await self.deliver(channel, embed, view, silent, song, may_edit=silent)
+
+    async def announce_now(self, channel, embed, view, silent, song=None):
+        """Post a fresh card right away, dropping any pending one"""
+        if self.pending:
+            self.pending = None
+            self.coalesced += 1
+        self.window_ends = time.monotonic() + ANNOUNCE_COALESCE_SECONDS
+        await self.deliver(channel, embed, view, silent, song, may_edit=False)
+
+    async def _flush(self, delay):
+        await asyncio.sleep(delay)
+        if not self.pending:
+            return
+        channel, embed, view, silent, song = self.pending
+        self.pending = None
+        self.window_ends = time.monotonic() + ANNOUNCE_COALESCE_SECONDS
+        try:
+            # The burst already announced itself once
+            await self.deliver(channel, embed, view, silent, song, may_edit=True)
+        except discord.HTTPException as e:
+            logging.warning(f"Failed to send announcement to channel {channel.id}: {e}")
+
+    async def deliver(self, channel, embed, view, silent, song=None, *, may_edit):
+        """Show `embed`, editing the channel's last card if allowed. With
+        `song`, the card is a now-playing card for it and is kept live."""
+        card = self.cards.get(channel.id)
+        if may_edit and card and getattr(channel, "last_message_id", None) == card.id:
+            try:
+                # view=None strips the buttons off a card that had them
+                await card.edit(embed=embed, view=view or None)
+                self.edited += 1
+            except discord.NotFound:
+                card = None  # deleted meanwhile - send a new one
+        else:
+            card = None
+        if card is None:
+            # view is falsy when absent (None or discord.utils.MISSING)
+            kwargs = {"view": view} if view else {}
+            card = self.cards[channel.id] = await channel.send(embed=embed, silent=silent, **kwargs)
+            self.sent += 1
+
+        self.live = (card, embed, song) if song and LIVE_CARD_SECONDS > 0 else None
+        guild_id = channel.guild.id
+        if self.live:
+            timers.schedule(("live_card", guild_id), LIVE_CARD_SECONDS, lambda: update_live_card(guild_id))
+        else:
+            timers.cancel(("live_card", guild_id))
+
+
+async def update_live_card(guild_id):
+    """Timer callback: refresh the progress bar on a guild's live now-playing
+    card, then re-arm. Edits are skipped while paused or nobody is in the
+    channel to see them; the card stops being live once its song is over."""
+    queue = music_queues.get(guild_id)
+    if not queue or not queue.announcer.live:
+        return
+    card, embed, song = queue.announcer.live
+    guild = bot.get_guild(guild_id)
+    voice_client = guild.voice_client if guild else None
+    if song is not queue.current or not queue.is_playing or not voice_client:
+        queue.announcer.live = None
+        return
+
+    position = playback_position(guild_id)
+    if voice_client.is_playing() and position is not None and not voice_channel_is_empty(voice_client.channel):
+        embed.description = now_playing_description(song, position)
+        try:
+            await card.edit(embed=embed)
+        except discord.NotFound:
+            queue.announcer.live = None
+            return
+        except discord.HTTPException as e:
+            logging.debug(f"Failed to update live card in guild {guild_id}: {e}")
+    if queue.announcer.live and queue.announcer.live[0] is card:
+        timers.schedule(("live_card", guild_id), LIVE_CARD_SECONDS, lambda: update_live_card(guild_id))
+
+
+async def send_notification(channel, queue, *, embed, view=None, force=False, song=None):
     """Send an automatic (not user-command-triggered) playback announcement,
     honoring the guild's notify_mode: 'on' sends normally, 'mute' sends
     without pinging anyone, 'off' skips it entirely. force=True bypasses the
     'off' skip - used by /playnow, whose card is a deliberate manual
-    announcement rather than an automatic one."""
+    announcement rather than an automatic one, and always posted fresh.
+
+    Announcements are coalesced per guild (see Announcer): within
+    ANNOUNCE_COALESCE_SECONDS of the last card only the latest is shown,
+    and a card still at the bottom of the channel is edited rather than
+    followed by a new one. Pass the playing `song` for a now-playing card to
+    keep its progress bar live (LIVE_CARD_SECONDS)."""
     if not channel or (queue.notify_mode == "off" and not force):
         return
-    # view is falsy when absent (None or discord.utils.MISSING)
-    kwargs = {"view": view} if view else {}
-    await channel.send(embed=embed, silent=(queue.notify_mode == "mute"), **kwargs)
+    silent = queue.notify_mode == "mute"
+    if force:
+        await queue.announcer.announce_now(channel, embed, view, silent, song)
+    else:
+        await queue.announcer.announce(channel, embed, view, silent, song)
+
+
+def mark_url_failed(url):
+    """Remember that `url` couldn't be resolved, for FAILED_URL_TTL seconds"""
+    failed_urls[url] = time.monotonic() + FAILED_URL_TTL
+    if len(failed_urls) > STREAM_CACHE_LIMIT:
+        now = time.monotonic()
+        for stale in [u for u, expiry in failed_urls.items() if expiry <= now]:
+            del failed_urls[stale]
+
+
+def url_recently_failed(url):
+    expiry = failed_urls.get(url)
+    if expiry is None:
+        return False
+    if expiry <= time.monotonic():
+        del failed_urls[url]
+        return False
+    return True
+
+
+async def pop_next_playable(queue, skipped):
+    """Take the next song that resolves off the front of the queue.
+
+    Songs whose URL failed recently are dropped without another attempt.
+    The next SKIP_AHEAD_CANDIDATES songs then start resolving concurrently
+    (so a run of dead links costs one round trip, not one each), and are
+    awaited in queue order: the first that resolves is popped and returned
+    straight away, without waiting on the ones behind it, and the ones in
+    front of it are dropped, each counting as a playback error. Returns
+    None if none of the candidates resolved. Dropped songs are appended to
+    `skipped`. Raises UpstreamUnavailable, leaving the song queued, if the
+    one next in line is behind an open circuit breaker.
+    """
+    while queue.queue and url_recently_failed(queue.queue[0]["url"]):
+        skipped.append(queue.get_next())
+    if not queue.queue:
+        return None
+
+    candidates = list(itertools.islice(queue.queue, SKIP_AHEAD_CANDIDATES))
+    resolving = [asyncio.ensure_future(resolve_stream(song["url"])) for song in candidates]
+    try:
+        for song, task in zip(candidates, resolving):
+            try:
+                await task
+            except UpstreamUnavailable:
+                if song in queue.queue:
+                    raise
+                continue
+            except Exception as e:
+                note_unresolvable(song, e)
+                # The queue may have been edited (/remove, /move) meanwhile
+                if queue.remove_song(song):
+                    queue.increment_error_count()
+                    skipped.append(song)
+                continue
+            if queue.remove_song(song):
+                return song
+        return None
+    finally:
+        # The candidates behind the one returned carry on resolving, which
+        # warms the stream cache for when their turn comes; one that fails
+        # is dropped by the check above then.
+        for song, task in zip(candidates, resolving):
+            if not task.done():
+                task.add_done_callback(functools.partial(finish_lookahead, song))
+
+
+def finish_lookahead(song, task):
+    """Done callback of a candidate resolve pop_next_playable didn't wait for"""
+    if not task.cancelled() and task.exception() is not None:
+        note_unresolvable(song, task.exception())
+
+
+def note_unresolvable(song, error):
+    logging.warning(f"Skipping unplayable song {song['url']}: {error}")
+    # A fast fail on an open circuit breaker says the host is down, not that
+    # the song is - don't blacklist it
+    if not isinstance(error, UpstreamUnavailable):
+        mark_url_failed(song["url"])
+
+
+def skipped_songs_text(skipped, limit=5):
+    """Comma-separated titles for a 'skipped' notice, capped at `limit`"""
+    text = ", ".join(f"**{s['title']}**" for s in skipped[:limit])
+    if len(skipped) > limit:
+        text += f" and {len(skipped) - limit} more"
+    return text
 
 
 async def advance_queue(guild_id, channel, finished=None, errored=False):
     """Play the next song after `finished` ended (or kick off playback when
     called with no `finished`, e.g. from /play on an idle queue), honoring the
-    guild's loop mode. Stops if the queue is empty or too many consecutive
-    errors have piled up."""
+    guild's loop mode. Songs that can't be played are skipped (see
+    pop_next_playable) and reported in one announcement. Stops if the queue
+    is empty or too many consecutive errors have piled up."""
     queue = get_queue(guild_id)
 
     skip_requested = queue.skip_requested
     queue.skip_requested = False
-
-    if queue.get_error_count() >= MAX_PLAYBACK_ERRORS:
-        queue.is_playing = False
-        queue.reset_error_count()
-        embed = discord.Embed(
-            title="❌ Playback Stopped",
-            description=f"Stopped after {MAX_PLAYBACK_ERRORS} consecutive playback errors. Use `/play` to try again.",
-            color=0xFF0000,
-        )
-        await send_notification(channel, queue, embed=embed)
-        logging.warning(f"Stopped playback in guild {guild_id} after {MAX_PLAYBACK_ERRORS} consecutive errors")
-        return
+    skipped = []
 
     if finished is not None and not errored:
         # Log it, unless this is just the same song coming around again
@@ -920,38 +3606,112 @@ async def advance_queue(guild_id, channel, finished=None, errored=False):
         if queue.loop_mode == "song" and not skip_requested:
             # Replay without an announcement - repeats aren't news. On
             # extraction failure fall through to normal advancement; the
-            # error breaker above caps how often this can retry.
-            if await play_song(guild_id, channel, finished):
+            # error breaker below caps how often this can retry.
+            try:
+                if queue.get_error_count() < MAX_PLAYBACK_ERRORS and await play_song(
+                    guild_id, channel, finished, raise_unavailable=True
+                ):
+                    return
+            except UpstreamUnavailable as e:
+                queue.add(finished, "next")
+                await wait_for_upstream(guild_id, channel, queue, e)
                 return
             queue.increment_error_count()
-            await advance_queue(guild_id, channel)
+            mark_url_failed(finished["url"])
+            skipped.append(finished)
+        elif queue.loop_mode == "queue":
+            queue.requeue(finished)
+
+    song_info = None
+    while queue.get_error_count() < MAX_PLAYBACK_ERRORS and (
+        queue.queue or queue_autoplay_candidate(queue)
+    ):
+        try:
+            song_info = await pop_next_playable(queue, skipped)
+            if song_info is None:
+                continue
+            start_seconds = queue.take_resume_position(song_info)
+            if await play_song(guild_id, channel, song_info, start_seconds, raise_unavailable=True):
+                break
+        except UpstreamUnavailable as e:
+            if song_info is not None:
+                queue.add(song_info, "next")
+                if start_seconds:
+                    queue.resume = (song_info, start_seconds)
+            await wait_for_upstream(guild_id, channel, queue, e)
             return
-        if queue.loop_mode == "queue":
-            queue.add(finished, "end")
+        guild = bot.get_guild(guild_id)
+        if not guild or not guild.voice_client:
+            song_info = None  # disconnected meanwhile, not the song's fault
+            break
+        queue.increment_error_count()
+        mark_url_failed(song_info["url"])
+        skipped.append(song_info)
+        song_info = None
 
-    if not queue.queue:
+    if song_info is None:
         queue.is_playing = False
         save_state()
+        if queue.get_error_count() >= MAX_PLAYBACK_ERRORS:
+            queue.reset_error_count()
+            description = f"Stopped after {MAX_PLAYBACK_ERRORS} consecutive playback errors. Use `/play` to try again."
+            if skipped:
+                description += f"\nSkipped {skipped_songs_text(skipped)}"
+            embed = discord.Embed(title="❌ Playback Stopped", description=description, color=0xFF0000)
+            await send_notification(channel, queue, embed=embed)
+            logging.warning(f"Stopped playback in guild {guild_id} after {MAX_PLAYBACK_ERRORS} consecutive errors")
+        elif skipped:
+            embed = discord.Embed(
+                title="⚠️ Skipped Unplayable Songs",
+                description=f"Skipped {skipped_songs_text(skipped)}",
+                color=0xFFA500,
+            )
+            await send_notification(channel, queue, embed=embed)
         return
 
-    song_info = queue.get_next()
+    queue.reset_error_count()
+    timers.cancel(("upstream_retry", guild_id))
+    save_state()
+    prefetch_autoplay(queue)
+    # A ring under loop_mode "queue" can cycle back to the exact song
+    # that just finished (e.g. a single-song queue) - skip the
+    # announcement then too, same reasoning as the song-loop skip above:
+    # nothing changed, so it isn't news.
+    if song_info is not finished or skipped:
+        embed = build_now_playing_embed(
+            song_info,
+            label=f"🎵 Now Playing{loop_suffix(queue)}",
+            footer="📻 Autoplay" if song_info.get("autoplay") else None,
+            up_next=queue.queue[0]["title"] if queue.queue else None,
+            position=playback_position(guild_id) if LIVE_CARD_SECONDS > 0 else None,
+        )
+        if skipped:
+            embed.add_field(name="⚠️ Skipped", value=skipped_songs_text(skipped)[:1024], inline=False)
+        await send_notification(channel, queue, embed=embed, view=controls_view(), song=song_info)
 
-    if await play_song(guild_id, channel, song_info):
-        queue.reset_error_count()
-        save_state()
-        # A ring under loop_mode "queue" can cycle back to the exact song
-        # that just finished (e.g. a single-song queue) - skip the
-        # announcement then too, same reasoning as the song-loop skip above:
-        # nothing changed, so it isn't news.
-        if song_info is not finished:
-            embed = build_now_playing_embed(
-                song_info,
-                label=f"🎵 Now Playing{loop_suffix(queue)}",
-                up_next=queue.queue[0]["title"] if queue.queue else None,
-            )
-            await send_notification(channel, queue, embed=embed, view=controls_view())
-    else:
-        queue.increment_error_count()
+
+async def wait_for_upstream(guild_id, channel, queue, error):
+    """The next song's host is behind an open circuit breaker: that says
+    nothing about the song, so rather than drop it (or count it towards
+    MAX_PLAYBACK_ERRORS), leave it queued and try again once the breaker
+    lets a probe through."""
+    queue.is_playing = False
+    save_state()
+    delay = max(error.retry_in, UPSTREAM_RETRY_MIN_SECONDS)
+    logging.warning(f"Pausing the queue in guild {guild_id} for {delay:.0f}s: {error}")
+    timers.schedule(("upstream_retry", guild_id), delay, lambda: retry_advance(guild_id, channel))
+    embed = discord.Embed(
+        title="⏳ Waiting for Upstream",
+        description=f"The next song's host is having trouble; trying again in about {delay:.0f}s.",
+        color=0xFFA500,
+    )
+    await send_notification(channel, queue, embed=embed)
+
+
+async def retry_advance(guild_id, channel):
+    """Timer callback of wait_for_upstream()"""
+    guild = bot.get_guild(guild_id)
+    if guild and guild.voice_client and not get_queue(guild_id).is_playing:
         await advance_queue(guild_id, channel)
 
 
@@ -973,22 +3733,19 @@ def voice_channel_is_empty(channel):
     return not any(not m.bot for m in channel.members)
 
 
-def cancel_auto_leave(queue):
-    if queue.leave_task and not queue.leave_task.done():
-        queue.leave_task.cancel()
-    queue.leave_task = None
+def cancel_auto_leave(guild_id):
+    timers.cancel(("auto_leave", guild_id))
 
 
-async def auto_leave_after_delay(guild_id, voice_client):
-    """Disconnect after AUTO_LEAVE_SECONDS alone in the channel. Cancelled by
-    cancel_auto_leave() if someone rejoins first; the emptiness recheck below
-    is a last-moment safety net against that race."""
-    try:
-        await asyncio.sleep(AUTO_LEAVE_SECONDS)
-    except asyncio.CancelledError:
-        return
+async def auto_leave(guild_id, voice_client):
+    """Timer callback: disconnect after AUTO_LEAVE_SECONDS alone in the
+    channel. The timer is cancelled by cancel_auto_leave() if someone rejoins
+    first; the emptiness recheck below is a last-moment safety net."""
     if voice_client.is_connected() and voice_channel_is_empty(voice_client.channel):
         logging.info(f"Auto-leaving voice in guild {guild_id}: alone for {AUTO_LEAVE_SECONDS}s")
+        queue = get_queue(guild_id)
+        queue.leaving = True
+        queue.generation += 1  # so the song stopping doesn't advance the queue
         await voice_client.disconnect()
 
 
@@ -999,20 +3756,173 @@ async def on_channel_emptied(guild_id, voice_client, queue):
         voice_client.pause()
         queue.auto_paused = True
 
-    if AUTO_LEAVE_SECONDS > 0 and (queue.leave_task is None or queue.leave_task.done()):
-        queue.leave_task = asyncio.create_task(auto_leave_after_delay(guild_id, voice_client))
+    if AUTO_LEAVE_SECONDS > 0 and not timers.pending(("auto_leave", guild_id)):
+        timers.schedule(
+            ("auto_leave", guild_id), AUTO_LEAVE_SECONDS, lambda: auto_leave(guild_id, voice_client)
+        )
 
 
-def on_channel_repopulated(voice_client, queue):
+def on_channel_repopulated(guild_id, voice_client, queue):
     """Someone (re)joined the bot's voice channel: cancel any pending
     auto-leave timer and resume playback if AUTO_PAUSE was the one that
     paused it (a deliberate /pause is left alone)."""
-    cancel_auto_leave(queue)
+    cancel_auto_leave(guild_id)
     if queue.auto_paused and voice_client.is_paused():
         voice_client.resume()
     queue.auto_paused = False
 
 
+def park_source(guild_id, generation, song_info, source, channel, voice_channel):
+    """The song's voice connection dropped under it (see after_playing):
+    hold on to its still-open source so reconnect_voice() can carry on with
+    it, unless the session has ended in the meantime. Starts reconnecting
+    if nothing else has yet, as when discord.py gives up on rebuilding a
+    dropped connection itself and tears its voice client down."""
+    queue = get_queue(guild_id)
+    if bot.is_closed() or generation != queue.generation:
+        source.release()
+        return
+    if queue.parked:
+        queue.parked[1].release()
+    queue.parked = (song_info, source, channel)
+    if not (queue.reconnect_task and not queue.reconnect_task.done()):
+        if should_reconnect(queue, voice_channel):
+            start_reconnect(guild_id, queue, voice_channel)
+
+
+class JukeboxVoiceClient(discord.VoiceClient):
+    """VoiceClient that notes on the guild's queue whether each disconnect
+    was one discord.py made itself (tearing down a dropped connection to
+    rebuild it, or giving up on doing so) or one Discord forced on it.
+
+    discord.py only expects a channel-less voice state while it is leaving
+    on its own; a moderator's Disconnect, a kick or the channel being
+    deleted arrive unannounced. Its handler resets that expectation, so
+    it is read here, before the handler runs and before the
+    on_voice_state_update event (dispatched after this) gets to look.
+    """
+
+    async def on_voice_state_update(self, data):
+        if data["channel_id"] is None:
+            expected = getattr(self._connection, "_expecting_disconnect", False)
+            get_queue(self.guild.id).disconnect_forced = not expected
+        await super().on_voice_state_update(data)
+
+
+def should_reconnect(queue, channel):
+    """Whether the bot leaving `channel` looks like a dropped connection
+    worth recovering from, rather than the end of the session"""
+    if VOICE_RECONNECT_SECONDS <= 0 or queue.leaving or bot.is_closed():
+        return False
+    if queue.disconnect_forced:
+        return False  # disconnected by a moderator, not by the network
+    if not (queue.current and queue.is_playing) or channel is None:
+        return False
+    if voice_channel_is_empty(channel):
+        return False  # nobody left to play to
+    # Dropped again right after reconnecting: something keeps throwing us out
+    return not (
+        queue.reconnected_at is not None
+        and time.monotonic() - queue.reconnected_at < VOICE_RECONNECT_SECONDS
+    )
+
+
+def start_reconnect(guild_id, queue, channel):
+    """Run reconnect_voice() for a connection that dropped just now"""
+    logging.warning(f"Dropped from voice in guild {guild_id}; reconnecting to {channel}")
+    cancel_auto_leave(guild_id)
+    queue.reconnect_task = asyncio.create_task(
+        reconnect_voice(guild_id, channel, time.monotonic())
+    )
+
+
+async def reconnect_voice(guild_id, channel, disconnected_at):
+    """Rejoin `channel` after a dropped connection and resume the current
+    song: on its parked source if playback stopped cleanly (no new
+    extraction, and the read-ahead buffer is still full), otherwise by
+    reopening it at the parked position. A voice client that is still
+    around (discord.py rebuilding the connection, or a /join) is waited on
+    rather than raced, and if its player carried on through the drop it is
+    left alone. Retries with backoff for up to VOICE_RECONNECT_SECONDS,
+    then gives up and ends the session."""
+    queue = get_queue(guild_id)
+    stats = voice_send_stats.setdefault(guild_id, VoiceSendStats())
+    deadline = disconnected_at + VOICE_RECONNECT_SECONDS
+    delay = 0.5  # also lets the player thread park the source first
+    voice_client = None
+    while time.monotonic() < deadline:
+        await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        guild = bot.get_guild(guild_id)
+        if not guild or bot.is_closed() or voice_channel_is_empty(channel):
+            break
+        voice_client = guild.voice_client
+        if voice_client:
+            if voice_client.is_connected():
+                break  # discord.py's own retry, or a /join, got there first
+            delay = 0.5
+            continue
+        try:
+            voice_client = await channel.connect(
+                timeout=max(1.0, deadline - time.monotonic()), cls=JukeboxVoiceClient
+            )
+            break
+        except Exception as e:
+            logging.warning(f"Voice reconnect to {channel} in guild {guild_id} failed: {e!r}")
+            delay = min(delay * 2, 5)
+
+    parked, queue.parked = queue.parked, None
+    song = queue.current
+    resumed = False
+    if voice_client and voice_client.is_connected() and song:
+        if not parked and (voice_client.is_playing() or voice_client.is_paused()):
+            resumed = True  # the player only waited out the drop
+        elif parked and parked[0] is song:
+            resumed = start_playback(guild_id, parked[2], song, parked[1])
+            parked = None
+        else:
+            position = parked[1].position if parked else 0
+            resumed = await play_song(guild_id, parked[2] if parked else None, song, position)
+    if parked:
+        parked[1].release()
+
+    if resumed:
+        reconnect_ms = (time.monotonic() - disconnected_at) * 1000
+        stats.record_reconnect(reconnect_ms)
+        queue.reconnected_at = time.monotonic()
+        logging.info(f"Reconnected to voice in guild {guild_id} and resumed after {reconnect_ms:.0f} ms")
+        return
+    stats.reconnect_failures += 1
+    logging.warning(f"Giving up reconnecting to voice in guild {guild_id}")
+    queue.reconnect_task = None  # not cancelled by ending the session
+    end_voice_session(guild_id, queue)
+    guild = bot.get_guild(guild_id)
+    if guild and guild.voice_client:
+        await guild.voice_client.disconnect(force=True)
+
+
+def end_voice_session(guild_id, queue):
+    """The bot left voice for good (/leave, kicked, dragged out, auto-leave,
+    a disconnect reconnecting couldn't recover from): forget what was
+    playing and clear the session history. The queue itself is kept so a
+    /join + /play can pick up where things left off."""
+    queue.generation += 1  # stale-ify any in-flight after_playing callback
+    queue.current = None
+    queue.is_playing = False
+    queue.skip_requested = False
+    queue.auto_paused = False
+    queue.leaving = False
+    queue.history.clear()
+    queue.autoplay_pool.clear()
+    if queue.parked:
+        queue.parked[1].release()
+        queue.parked = None
+    if queue.reconnect_task and not queue.reconnect_task.done():
+        queue.reconnect_task.cancel()
+    queue.reconnect_task = None
+    cancel_auto_leave(guild_id)
+    timers.cancel(("upstream_retry", guild_id))
+
+
 @bot.event
 async def on_voice_state_update(member, before, after):
     guild = member.guild
@@ -1020,18 +3930,17 @@ async def on_voice_state_update(member, before, after):
     if member.id == bot.user.id:
         if after.channel is not None:
             return
-        # End the playback session when the bot leaves voice for any reason
-        # (/leave, kicked, dragged out, auto-leave, disconnected): forget
-        # what was playing and clear the session history. The queue itself
-        # is kept so a /join + /play can pick up where things left off.
         queue = get_queue(guild.id)
-        queue.generation += 1  # stale-ify any in-flight after_playing callback
-        queue.current = None
-        queue.is_playing = False
-        queue.skip_requested = False
-        queue.auto_paused = False
-        queue.history.clear()
-        cancel_auto_leave(queue)
+        if queue.reconnect_task and not queue.reconnect_task.done():
+            return  # a failed attempt of the running reconnect_voice()
+        if should_reconnect(queue, before.channel):
+            if not guild.voice_client:
+                start_reconnect(guild.id, queue, before.channel)
+            # else discord.py is rebuilding the dropped connection itself,
+            # with the player waiting on it; if it gives up, tearing the
+            # client down parks the song and park_source() takes over
+            return
+        end_voice_session(guild.id, queue)
         return
 
     voice_client = guild.voice_client
@@ -1047,7 +3956,7 @@ async def on_voice_state_update(member, before, after):
     if voice_channel_is_empty(voice_client.channel):
         await on_channel_emptied(guild.id, voice_client, queue)
     else:
-        on_channel_repopulated(voice_client, queue)
+        on_channel_repopulated(guild.id, voice_client, queue)
 
 
 INVITE_RE = re.compile(
@@ -1126,7 +4035,7 @@ async def on_message(message: discord.Message):
         return
 
     try:
-        await channel.connect()
+        await channel.connect(cls=JukeboxVoiceClient)
     except Exception as e:
         logging.error(f"Failed to join {channel} via invite: {e}", exc_info=True)
         await message.channel.send(f"❌ Failed to join **{channel.name}**: {e}")
@@ -1160,18 +4069,22 @@ async def cmd_play(interaction: discord.Interaction, query: str):
             await interaction.followup.send("❌ No songs found!")
             return
 
-        # Add all songs to queue
-        for entry in entries:
-            queue.add(build_song_info(entry, interaction.user), "end")
+        eta = None
+        if queue.is_playing and queue.current:
+            eta = queue.time_until_end(playback_position(interaction.guild.id))
+        queue.extend(entries, interaction.user)
         save_state()
 
         # Send response based on single vs playlist
-        await interaction.followup.send(
+        message = (
             f"✅ Added to queue: **{entries[0]['title']}**"
             if is_single_video
             else f"✅ Added {len(entries)} songs from playlist to queue"
             + (f" (limited from {total_count} total)" if was_limited else "")
         )
+        if eta:
+            message += f" · {'plays' if is_single_video else 'first plays'} {format_eta(eta)}"
+        await interaction.followup.send(message)
 
         # Start playing if not already playing
         if not queue.is_playing:
@@ -1212,8 +4125,7 @@ async def cmd_playnow(interaction: discord.Interaction, query: str):
 
         # Add remaining songs to front of queue (if playlist)
         remaining_entries = entries[1:]
-        for entry in reversed(remaining_entries):
-            queue.add(build_song_info(entry, interaction.user), "next")
+        queue.extend(remaining_entries, interaction.user, position=0)
 
         success = await play_song(interaction.guild.id, interaction.channel, song_info)
         if not success:
@@ -1227,6 +4139,7 @@ async def cmd_playnow(interaction: discord.Interaction, query: str):
             color=0xFF4500,  # Orange color to distinguish from regular play
             footer="▶️ Playing immediately (skipped queue)",
             up_next=queue.queue[0]["title"] if queue.queue else None,
+            position=playback_position(interaction.guild.id) if LIVE_CARD_SECONDS > 0 else None,
         )
         if remaining_entries:
             embed.add_field(
@@ -1242,7 +4155,9 @@ async def cmd_playnow(interaction: discord.Interaction, query: str):
         # through send_notification (force=True to bypass notify_mode "off")
         # rather than the followup, because once the interaction was
         # deferred ephemeral, Discord locks every followup to ephemeral too.
-        await send_notification(interaction.channel, queue, embed=embed, view=controls_view(), force=True)
+        await send_notification(
+            interaction.channel, queue, embed=embed, view=controls_view(), force=True, song=song_info
+        )
         await interaction.followup.send("▶️ Playing now!", ephemeral=EPHEMERAL_REPLIES)
 
     except Exception as e:
@@ -1273,17 +4188,20 @@ async def cmd_playnext(interaction: discord.Interaction, query: str):
             await interaction.followup.send("❌ No songs found!")
             return
 
-        # Add all songs to front of queue in reverse order so first song plays first
-        for entry in reversed(entries):
-            queue.add(build_song_info(entry, interaction.user), "next")
+        queue.extend(entries, interaction.user, position=0)
         save_state()
 
-        await interaction.followup.send(
+        message = (
             f"📃 Added to queue: **{entries[0]['title']}**"
             if is_single_video
             else f"📃 Added {len(entries)} songs from playlist to queue"
             + (f" (limited from {total_count} total)" if was_limited else "")
         )
+        if queue.is_playing and queue.current:
+            eta = next(queue.etas(playback_position(interaction.guild.id)), None)
+            if eta:
+                message += f" · {'plays' if is_single_video else 'first plays'} {format_eta(eta)}"
+        await interaction.followup.send(message)
 
         # Start playing if not already playing
         if not queue.is_playing:
@@ -1294,19 +4212,11 @@ async def cmd_playnext(interaction: discord.Interaction, query: str):
         await interaction.followup.send(f"❌ An error occurred: {str(e)}")
 
 
-@bot.tree.command(name="queue", description="Show the current queue")
-async def cmd_queue(interaction: discord.Interaction):
-    if not await ensure_guild(interaction):
-        return
-
-    queue = get_queue(interaction.guild.id)
-    queue_list = queue.get_queue_list()
-
-    if not queue_list and not queue.current:
-        await interaction.response.send_message("📭 Queue is empty!", ephemeral=True)
-        return
-
-    total_songs = len(queue_list) + (1 if queue.current else 0)
+def build_queue_embed(queue, elapsed=None):
+    """The /queue card: now playing plus the first 10 queued songs, with
+    when each starts given the current song is `elapsed` seconds in"""
+    queued = len(queue.queue)
+    total_songs = queued + (1 if queue.current else 0)
     embed = discord.Embed(
         title=f"📃 Music Queue · {total_songs} song{'s' if total_songs != 1 else ''}",
         color=0x0099FF,
@@ -1314,13 +4224,21 @@ async def cmd_queue(interaction: discord.Interaction):
     loop_label = {"queue": "🔁 Looping the queue", "song": "🔂 Looping the current song"}.get(
         queue.loop_mode
     )
-    if loop_label:
-        embed.description = loop_label
+    mode_labels = [
+        loop_label,
+        "🔀 Shuffle play - the order below is what will play" if queue.shuffled else None,
+        "⚖️ Fair queue - requesters take turns" if queue.fair else None,
+    ]
+    if any(mode_labels):
+        embed.description = "\n".join(label for label in mode_labels if label)
 
     if queue.current:
         details = []
         if queue.current["duration"]:
-            details.append(format_duration(queue.current["duration"]))
+            if elapsed is not None:
+                details.append(f"{format_position(elapsed)} / {format_duration(queue.current['duration'])}")
+            else:
+                details.append(format_duration(queue.current["duration"]))
         details.append(f"requested by {queue.current['requester'].mention}")
         embed.add_field(
             name="🎵 Now Playing",
@@ -1328,24 +4246,59 @@ async def cmd_queue(interaction: discord.Interaction):
             inline=False,
         )
 
-    if queue_list:
+    if queued:
+        etas = queue.etas(elapsed) if queue.current else iter(())
         lines = []
-        for i, song in enumerate(queue_list[:10], 1):  # Show first 10 songs
+        for i, song in enumerate(itertools.islice(queue.queue, 10), 1):  # Show first 10 songs
             details = []
             if song["duration"]:
                 details.append(format_duration(song["duration"]))
             details.append(song["requester"].mention)
+            eta = next(etas, None)
+            if eta:
+                details.append(format_eta(eta))
             lines.append(f"`{i}.` **{song['title']}** · " + " · ".join(details))
 
         embed.add_field(name="⏭️ Up Next", value="\n".join(lines)[:1024], inline=False)
 
-        if len(queue_list) > 10:
+        if queued > 10:
             embed.add_field(
-                name="...", value=f"And {len(queue_list) - 10} more songs", inline=False
+                name="...", value=f"And {queued - 10} more songs", inline=False
+            )
+
+        if len(queue.requester_totals) > 1:
+            busiest = sorted(queue.requester_totals.items(), key=lambda item: -item[1][0])[:5]
+            embed.add_field(
+                name="👥 Requested By",
+                value="\n".join(
+                    f"{RequesterRef(requester_id).mention} · {songs} song{'s' if songs != 1 else ''}"
+                    + (f" · {format_duration(seconds)}" if seconds else "")
+                    for requester_id, (songs, seconds) in busiest
+                ),
+                inline=False,
             )
 
-        embed.set_footer(text="Use /move and /remove to manage the queue")
+        footer = "Use /move and /remove to manage the queue"
+        if queue.total_duration:
+            total = format_duration(queue.total_duration) + ("+" if queue.unknown_durations else "")
+            footer = f"{total} queued · {footer}"
+        embed.set_footer(text=footer)
+
+    return embed
+
+
+@bot.tree.command(name="queue", description="Show the current queue")
+async def cmd_queue(interaction: discord.Interaction):
+    if not await ensure_guild(interaction):
+        return
+
+    queue = get_queue(interaction.guild.id)
+
+    if not queue.queue and not queue.current:
+        await interaction.response.send_message("📭 Queue is empty!", ephemeral=True)
+        return
 
+    embed = build_queue_embed(queue, playback_position(interaction.guild.id))
     await interaction.response.send_message(embed=embed, ephemeral=EPHEMERAL_REPLIES)
 
 
@@ -1453,12 +4406,7 @@ async def previous_impl(interaction: discord.Interaction):
 
     # Walk history back to the most recent song that isn't the one already
     # playing (identity check: a looping song logs itself once but IS current).
-    target = None
-    for i in range(len(queue.history) - 1, -1, -1):
-        if queue.history[i] is not queue.current:
-            target = queue.history[i]
-            del queue.history[i]
-            break
+    target = queue.history.take_previous(exclude=queue.current)
 
     if target is None and queue.current is None:
         await interaction.response.send_message(
@@ -1480,10 +4428,7 @@ async def previous_impl(interaction: discord.Interaction):
 
     # Under queue-loop the finished song was re-appended to the ring; pull that
     # copy (same object) back out so it doesn't come around twice.
-    for i, song in enumerate(queue.queue):
-        if song is target:
-            del queue.queue[i]
-            break
+    queue.remove_song(target)
 
     interrupted = queue.current
     if await play_song(interaction.guild.id, interaction.channel, target):
@@ -1505,6 +4450,83 @@ async def cmd_previous(interaction: discord.Interaction):
     await previous_impl(interaction)
 
 
+async def seek_impl(interaction: discord.Interaction, target=None, delta=None):
+    """Jump to `target` seconds, or by `delta` seconds from the current
+    position - shared by /seek, /forward and /rewind.
+
+    Short jumps are served from the read-ahead buffer (its retained history
+    for rewinds, frames already buffered for forwards); anything further
+    re-opens the cached stream URL with an FFmpeg -ss offset, without
+    running yt-dlp again while the URL is still valid."""
+    queue = get_queue(interaction.guild.id)
+    voice_client = interaction.guild.voice_client
+    source = voice_client.source if voice_client else None
+    if (
+        not isinstance(source, YTDLSource)
+        or not queue.current
+        or not (voice_client.is_playing() or voice_client.is_paused())
+    ):
+        await interaction.response.send_message("❌ Nothing is playing!", ephemeral=True)
+        return
+
+    position = source.position
+    if target is None:
+        target = position + delta
+    target = max(0.0, target)
+    duration = queue.current["duration"]
+    if duration and target >= duration:
+        await interaction.response.send_message(
+            f"❌ **{queue.current['title']}** is only {format_duration(duration)} long!",
+            ephemeral=True,
+        )
+        return
+
+    if source.buffer and source.buffer.seek_by(target - position):
+        await interaction.response.send_message(
+            f"⏩ Jumped to {format_position(target)}", ephemeral=EPHEMERAL_REPLIES
+        )
+        return
+
+    await interaction.response.defer(ephemeral=EPHEMERAL_REPLIES)
+    was_paused = voice_client.is_paused()
+    if await play_song(interaction.guild.id, interaction.channel, queue.current, start_seconds=target):
+        if was_paused:
+            interaction.guild.voice_client.pause()
+        await interaction.followup.send(f"⏩ Jumped to {format_position(target)}")
+    else:
+        await interaction.followup.send(f"❌ Failed to seek in **{queue.current['title']}**")
+
+
+@bot.tree.command(name="seek", description="Jump to a position in the current song")
+@app_commands.describe(position="Timestamp to jump to, e.g. 1:23 or 83")
+async def cmd_seek(interaction: discord.Interaction, position: str):
+    if not await ensure_guild(interaction):
+        return
+    target = parse_timestamp(position)
+    if target is None:
+        await interaction.response.send_message(
+            "❌ Invalid position! Use seconds (83) or M:SS (1:23)", ephemeral=True
+        )
+        return
+    await seek_impl(interaction, target=target)
+
+
+@bot.tree.command(name="forward", description="Skip forward in the current song")
+@app_commands.describe(seconds="How far to skip ahead (default 10)")
+async def cmd_forward(interaction: discord.Interaction, seconds: app_commands.Range[int, 1] = 10):
+    if not await ensure_guild(interaction):
+        return
+    await seek_impl(interaction, delta=seconds)
+
+
+@bot.tree.command(name="rewind", description="Jump back in the current song")
+@app_commands.describe(seconds="How far to jump back (default 10)")
+async def cmd_rewind(interaction: discord.Interaction, seconds: app_commands.Range[int, 1] = 10):
+    if not await ensure_guild(interaction):
+        return
+    await seek_impl(interaction, delta=-seconds)
+
+
 @bot.tree.command(name="join", description="Join your voice channel")
 async def cmd_join(interaction: discord.Interaction):
     # Check guild first, then voice connection
@@ -1541,12 +4563,14 @@ async def cmd_leave(interaction: discord.Interaction):
     if not await ensure_guild(interaction):
         return
 
+    queue = get_queue(interaction.guild.id)
     if interaction.guild.voice_client:
-        queue = get_queue(interaction.guild.id)
         queue.clear()
         queue.is_playing = False
         queue.current = None
         queue.history.clear()
+        queue.autoplay_pool.clear()
+        queue.leaving = True
         # Stale-ify the pending after_playing callback now rather than waiting
         # for on_voice_state_update, so nothing tries to advance mid-disconnect.
         queue.generation += 1
@@ -1555,6 +4579,13 @@ async def cmd_leave(interaction: discord.Interaction):
         await interaction.response.send_message(
             "👋 Left the voice channel", ephemeral=EPHEMERAL_REPLIES
         )
+    elif queue.reconnect_task and not queue.reconnect_task.done():
+        queue.clear()
+        end_voice_session(interaction.guild.id, queue)
+        save_state()
+        await interaction.response.send_message(
+            "👋 Stopped reconnecting to the voice channel", ephemeral=EPHEMERAL_REPLIES
+        )
     else:
         await interaction.response.send_message(
             "❌ I'm not in a voice channel!", ephemeral=True
@@ -1658,6 +4689,7 @@ async def cmd_nowplaying(interaction: discord.Interaction):
         queue.current,
         label=f"🎵 Now Playing{loop_suffix(queue)}",
         up_next=queue.queue[0]["title"] if queue.queue else None,
+        position=playback_position(interaction.guild.id),
     )
     await interaction.response.send_message(
         embed=embed, ephemeral=EPHEMERAL_REPLIES, view=controls_view()
@@ -1708,8 +4740,66 @@ async def cmd_loop(interaction: discord.Interaction, mode: app_commands.Choice[s
     await set_loop_impl(interaction, mode.value)
 
 
+@bot.tree.command(name="fairqueue", description="Take turns between requesters instead of first come, first served")
+@app_commands.describe(
+    mode="on=play each requester's songs in turn, off=play in the order songs were added"
+)
+@app_commands.choices(
+    mode=[
+        app_commands.Choice(name="on", value="on"),
+        app_commands.Choice(name="off", value="off"),
+    ]
+)
+async def cmd_fairqueue(interaction: discord.Interaction, mode: app_commands.Choice[str]):
+    if not await ensure_guild(interaction):
+        return
+
+    queue = get_queue(interaction.guild.id)
+    was_shuffled = queue.shuffled
+    queue.set_fair(mode.value == "on")
+    save_state()
+    if queue.fair:
+        message = "⚖️ Fair queue **on** - requesters now take turns"
+        if was_shuffled:
+            message += " (shuffle play is now off)"
+    else:
+        message = "⚖️ Fair queue **off** - songs play in the order they were added"
+    await interaction.response.send_message(message, ephemeral=EPHEMERAL_REPLIES)
+
+
+@bot.tree.command(name="autoplay", description="Keep playing related tracks when the queue runs out")
+@app_commands.describe(
+    mode="on=carry on with related tracks when the queue ends (loop off only), off=stop when the queue ends"
+)
+@app_commands.choices(
+    mode=[
+        app_commands.Choice(name="on", value="on"),
+        app_commands.Choice(name="off", value="off"),
+    ]
+)
+async def cmd_autoplay(interaction: discord.Interaction, mode: app_commands.Choice[str]):
+    if not await ensure_guild(interaction):
+        return
+
+    queue = get_queue(interaction.guild.id)
+    queue.autoplay = mode.value == "on"
+    if not queue.autoplay:
+        queue.autoplay_pool.clear()
+        queue.autoplay_seed = None
+    save_state()
+    prefetch_autoplay(queue)
+    if not queue.autoplay:
+        message = "📻 Autoplay **off** - playback stops when the queue runs out"
+    elif queue.loop_mode == "off":
+        message = "📻 Autoplay **on** - related tracks will play when the queue runs out"
+    else:
+        message = "📻 Autoplay **on** - it takes over when the queue runs out with `/loop off`"
+    await interaction.response.send_message(message, ephemeral=EPHEMERAL_REPLIES)
+
+
 @bot.tree.command(name="history", description="Show songs played this session")
-async def cmd_history(interaction: discord.Interaction):
+@app_commands.describe(page="Page to show, 10 songs each, most recent first (default 1)")
+async def cmd_history(interaction: discord.Interaction, page: app_commands.Range[int, 1] = 1):
     if not await ensure_guild(interaction):
         return
 
@@ -1721,16 +4811,57 @@ async def cmd_history(interaction: discord.Interaction):
         )
         return
 
+    pages = (len(queue.history) + 9) // 10
+    if page > pages:
+        await interaction.response.send_message(
+            f"❌ There {'is' if pages == 1 else 'are'} only {pages} page{'s' if pages != 1 else ''} of history!",
+            ephemeral=True,
+        )
+        return
+
     embed = discord.Embed(title="📜 Playback History", color=0x0099FF)
     history_text = ""
-    for i, song in enumerate(reversed(list(queue.history)[-10:]), 1):  # Most recent first
+    start = (page - 1) * 10
+    for i, song in enumerate(queue.history.page(start, 10), start + 1):  # Most recent first
         duration_str = f"({format_duration(song['duration'])})" if song["duration"] else ""
         history_text += f"**{i}.** **{song['title']}** {duration_str}\n   Requested by {song['requester'].mention}\n\n"
     embed.add_field(name="Most recent first", value=history_text[:1024], inline=False)
 
-    if len(queue.history) > 10:
-        embed.set_footer(text=f"And {len(queue.history) - 10} more this session")
+    if pages > 1:
+        embed.set_footer(text=f"Page {page}/{pages} · {len(queue.history)} songs this session")
+
+    await interaction.response.send_message(embed=embed, ephemeral=EPHEMERAL_REPLIES)
+
+
+@bot.tree.command(name="stats", description="Show the most played songs and requesters in this server")
+async def cmd_stats(interaction: discord.Interaction):
+    if not await ensure_guild(interaction):
+        return
+
+    guild_id = interaction.guild.id
+    plays, skips, seconds = play_stats.guild_totals(guild_id)
+    if not plays:
+        await interaction.response.send_message("📊 Nothing has been played here yet!", ephemeral=True)
+        return
 
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    embed = discord.Embed(
+        title="📊 Play Stats",
+        description=f"{plays} play{'s' if plays != 1 else ''} · {hours}h {minutes:02d}m listened · "
+        f"{skips * 100 // plays}% skipped",
+        color=0x0099FF,
+    )
+    lines = [
+        f"`{i}.` [{title}]({url}) · {count} play{'s' if count != 1 else ''}"
+        for i, (url, title, count, _) in enumerate(play_stats.top_tracks(10, guild_id), 1)
+    ]
+    embed.add_field(name="🎵 Most Played", value="\n".join(lines)[:1024], inline=False)
+    lines = [
+        f"{RequesterRef(requester_id).mention} · {count} play{'s' if count != 1 else ''}"
+        for requester_id, count, _ in play_stats.top_requesters(guild_id)
+    ]
+    if lines:
+        embed.add_field(name="👥 Top Requesters", value="\n".join(lines)[:1024], inline=False)
     await interaction.response.send_message(embed=embed, ephemeral=EPHEMERAL_REPLIES)
 
 
@@ -1745,19 +4876,43 @@ async def cmd_clear(interaction: discord.Interaction):
     await interaction.response.send_message("🗑️ Queue cleared!", ephemeral=EPHEMERAL_REPLIES)
 
 
-@bot.tree.command(name="shuffle", description="Shuffle the queue")
-async def cmd_shuffle(interaction: discord.Interaction):
+@bot.tree.command(name="shuffle", description="Shuffle the queue, or keep playing it in random order")
+@app_commands.describe(
+    mode="once=shuffle the queue now, on=always play in random order (reshuffled every loop), off=play in queue order"
+)
+@app_commands.choices(
+    mode=[
+        app_commands.Choice(name="once", value="once"),
+        app_commands.Choice(name="on", value="on"),
+        app_commands.Choice(name="off", value="off"),
+    ]
+)
+async def cmd_shuffle(interaction: discord.Interaction, mode: app_commands.Choice[str] = None):
     if not await ensure_guild(interaction):
         return
 
     queue = get_queue(interaction.guild.id)
-    queue_list = queue.get_queue_list()
 
-    if not queue_list:
+    if mode and mode.value in ("on", "off"):
+        was_fair = queue.fair
+        queue.set_shuffled(mode.value == "on")
+        save_state()
+        if queue.shuffled:
+            message = "🔀 Shuffle play **on** - songs play in random order, reshuffled each time the queue loops"
+            if was_fair:
+                message += " (fair queue is now off)"
+        else:
+            message = "🔀 Shuffle play **off** - songs play in queue order"
+        await interaction.response.send_message(message, ephemeral=EPHEMERAL_REPLIES)
+        return
+
+    size = len(queue.queue)
+
+    if not size:
         await interaction.response.send_message("📭 Queue is empty! Nothing to shuffle.", ephemeral=True)
         return
 
-    if len(queue_list) == 1:
+    if size == 1:
         await interaction.response.send_message("📭 Only one song in queue! Nothing to shuffle.", ephemeral=True)
         return
 
@@ -1765,7 +4920,7 @@ async def cmd_shuffle(interaction: discord.Interaction):
     queue.shuffle()
     save_state()
     await interaction.response.send_message(
-        f"🔀 Shuffled {len(queue_list)} songs in the queue!", ephemeral=EPHEMERAL_REPLIES
+        f"🔀 Shuffled {size} songs in the queue!", ephemeral=EPHEMERAL_REPLIES
     )
 
 
@@ -1777,9 +4932,9 @@ async def cmd_move(
         return
 
     queue = get_queue(interaction.guild.id)
-    queue_list = queue.get_queue_list()
+    size = len(queue.queue)
 
-    if not queue_list:
+    if not size:
         await interaction.response.send_message("📭 Queue is empty!", ephemeral=True)
         return
 
@@ -1787,9 +4942,9 @@ async def cmd_move(
     from_index = from_position - 1
     to_index = to_position - 1
 
-    if not (0 <= from_index < len(queue_list)) or not (0 <= to_index < len(queue_list)):
+    if not (0 <= from_index < size) or not (0 <= to_index < size):
         await interaction.response.send_message(
-            f"❌ Invalid position! Queue has {len(queue_list)} songs (1-{len(queue_list)})",
+            f"❌ Invalid position! Queue has {size} songs (1-{size})",
             ephemeral=True,
         )
         return
@@ -1800,16 +4955,15 @@ async def cmd_move(
         )
         return
 
-    # Remove and re-insert the song
-    song = queue_list.pop(from_index)
-    queue_list.insert(to_index, song)
-
-    # Update the queue
-    queue.queue = deque(queue_list)
+    song = queue.move(from_index, to_index)
     save_state()
 
+    landed = to_position
+    if queue.fair:
+        landed = next(i for i, queued in enumerate(queue.queue, 1) if queued is song)
     await interaction.response.send_message(
-        f"✅ Moved **{song['title']}** from position {from_position} to position {to_position}",
+        f"✅ Moved **{song['title']}** from position {from_position} to position {landed}"
+        + (" (the nearest its requester's turn allows)" if landed != to_position else ""),
         ephemeral=EPHEMERAL_REPLIES,
     )
 
@@ -1820,27 +4974,23 @@ async def cmd_remove(interaction: discord.Interaction, position: int):
         return
 
     queue = get_queue(interaction.guild.id)
-    queue_list = queue.get_queue_list()
+    size = len(queue.queue)
 
-    if not queue_list:
+    if not size:
         await interaction.response.send_message("📭 Queue is empty!", ephemeral=True)
         return
 
     # Convert to 0-based indexing
     index = position - 1
 
-    if not (0 <= index < len(queue_list)):
+    if not (0 <= index < size):
         await interaction.response.send_message(
-            f"❌ Invalid position! Queue has {len(queue_list)} songs (1-{len(queue_list)})",
+            f"❌ Invalid position! Queue has {size} songs (1-{size})",
             ephemeral=True,
         )
         return
 
-    # Remove the song
-    removed_song = queue_list.pop(index)
-
-    # Update the queue
-    queue.queue = deque(queue_list)
+    removed_song = queue.pop_at(index)
     save_state()
 
     await interaction.response.send_message(
@@ -1849,6 +4999,150 @@ async def cmd_remove(interaction: discord.Interaction, position: int):
     )
 
 
+@bot.tree.command(name="audiostats", description="Show voice-send timing diagnostics (admin)")
+@app_commands.default_permissions(manage_guild=True)
+async def cmd_audiostats(interaction: discord.Interaction):
+    if not await ensure_guild(interaction):
+        return
+
+    stats = voice_send_stats.get(interaction.guild.id)
+    if not stats or not stats.frames:
+        await interaction.response.send_message(
+            "📭 No audio has been sent in this server yet!", ephemeral=True
+        )
+        return
+
+    frame_ms = BufferedPCMAudio.FRAME_SECONDS * 1000
+    embed = discord.Embed(title="📈 Voice Send Diagnostics", color=0x0099FF)
+    embed.description = (
+        f"{stats.frames} frames sent · "
+        f"{stats.silence_frames * BufferedPCMAudio.FRAME_SECONDS:.1f}s of silence inserted"
+    )
+    embed.add_field(
+        name="⏱️ Send interval",
+        value=(
+            f"avg jitter {stats.mean_jitter_ms:.2f} ms (target {frame_ms:g} ms) · "
+            f"max {stats.max_interval_ms:.1f} ms · {stats.bursts} catch-up bursts\n"
+            f"`{stats.interval_ms.format()}`"
+        ),
+        inline=False,
+    )
+    embed.add_field(
+        name="📥 Frame read latency",
+        value=f"max {stats.max_read_ms:.2f} ms\n`{stats.read_ms.format()}`",
+        inline=False,
+    )
+    embed.add_field(
+        name="🕳️ Underruns",
+        value=(
+            f"{stats.underrun_streaks} streak(s), longest "
+            f"{stats.longest_underrun * BufferedPCMAudio.FRAME_SECONDS:.2f}s"
+        ),
+        inline=False,
+    )
+    if stats.reconnects or stats.reconnect_failures:
+        embed.add_field(
+            name="🔌 Voice reconnects",
+            value=(
+                f"{stats.reconnects} resumed (last took {stats.last_reconnect_ms / 1000:.1f}s) · "
+                f"{stats.reconnect_failures} given up\n`{stats.reconnect_ms.format()}`"
+            ),
+            inline=False,
+        )
+    announcer = get_queue(interaction.guild.id).announcer
+    if announcer.sent or announcer.edited or announcer.coalesced:
+        embed.add_field(
+            name="📨 Announcements",
+            value=(
+                f"{announcer.sent} card(s) sent · {announcer.edited} edited in place · "
+                f"{announcer.coalesced} coalesced ({announcer.edited + announcer.coalesced} messages saved)"
+            ),
+            inline=False,
+        )
+    embed.set_footer(text=f"Clock drift of the last finished track: {stats.last_drift_ms:+.0f} ms")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(name="upstreams", description="Show circuit-breaker state of upstream hosts (admin)")
+@app_commands.default_permissions(manage_guild=True)
+async def cmd_upstreams(interaction: discord.Interaction):
+    if not await ensure_guild(interaction):
+        return
+
+    if not circuit_breakers:
+        await interaction.response.send_message(
+            "📭 No upstream hosts contacted yet!", ephemeral=True
+        )
+        return
+
+    state_icons = {"closed": "🟢", "half-open": "🟡", "open": "🔴"}
+    lines = []
+    # Troubled hosts first
+    for breaker in sorted(
+        list(circuit_breakers.values()), key=lambda b: (b.state == "closed", b.host)
+    ):
+        line = (
+            f"{state_icons[breaker.state]} **{breaker.host}** · {breaker.state} · "
+            f"{sum(breaker.outcomes)}/{len(breaker.outcomes)} recent failures · "
+            f"{breaker.total_failures} total"
+        )
+        if breaker.state == "open":
+            line += f" · retry in {breaker.retry_in():.0f}s"
+        if breaker.rejected:
+            line += f" · {breaker.rejected} failed fast"
+        events = {k: n for k, n in ffmpeg_events.get(breaker.host, {}).items() if k != "other"}
+        if events:
+            line += " · FFmpeg " + ", ".join(f"{n} {kind}" for kind, n in sorted(events.items()))
+        lines.append(line)
+
+    embed = discord.Embed(
+        title="🔌 Upstream Hosts", description="\n".join(lines)[:4096], color=0x0099FF
+    )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(name="memstats", description="Show in-memory guild state and cache occupancy (admin)")
+@app_commands.default_permissions(manage_guild=True)
+async def cmd_memstats(interaction: discord.Interaction):
+    if not await ensure_guild(interaction):
+        return
+
+    queues = list(music_queues.values())
+    active = sum(1 for q in queues if q.current or q.is_playing)
+    queued = sum(len(q.queue) for q in queues)
+    history = sum(len(q.history.tail) for q in queues)
+    spilled = sum(q.history.spilled for q in queues)
+    # ru_maxrss is KiB on Linux but bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_rss_mib = peak_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+    embed = discord.Embed(title="🧠 Memory", color=0x0099FF)
+    embed.add_field(
+        name="🗂️ Guild queues",
+        value=(
+            f"{len(queues)} in memory ({active} playing) of {len(bot.guilds)} guilds · "
+            f"{queue_counters['created']} created, {queue_counters['evicted']} evicted when idle"
+            + (f" (after {QUEUE_EVICT_SECONDS}s)" if QUEUE_EVICT_SECONDS > 0 else " (eviction off)")
+        ),
+        inline=False,
+    )
+    embed.add_field(
+        name="🎵 Songs",
+        value=f"{queued} queued · {history} in session history (+{spilled} spilled to disk)",
+        inline=False,
+    )
+    embed.add_field(
+        name="🗄️ Caches",
+        value=(
+            f"{len(resolved_streams)}/{STREAM_CACHE_LIMIT} resolved streams · "
+            f"{len(failed_urls)} failed URLs · {len(timers.timers)} pending timers"
+        ),
+        inline=False,
+    )
+    embed.set_footer(text=f"Peak RSS {peak_rss_mib:.0f} MiB")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
 def load_opus():
     """Load Opus library on macOS if not already loaded"""
     if discord.opus.is_loaded():